@@ -0,0 +1,72 @@
+import os
+import sys
+import wave
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "IS_Graphy", "LSB"))
+from bitplane import payload_bits, embed_bits, LSBStreamReader
+
+# LSB steganography for PCM WAV files. Frames are streamed through in chunks,
+# so memory stays constant however long the recording is. The payload uses
+# the same null-terminated or k-LSB header layout as IS_Graphy/UDH/lib.py.
+# Bits go into the least significant byte of every sample, which is the
+# first byte of each sample in little-endian PCM.
+
+CHUNK_FRAMES = 1 << 16
+
+def _low_bytes(frames, width):
+    return np.frombuffer(frames, dtype=np.uint8)[::width]
+
+def encode_wav(input_path, message, output_path, bits_per_sample=None, chunk_frames=CHUNK_FRAMES):
+    bits, mask = payload_bits(message, bits_per_sample)
+    # Validate before the output is opened, so a rejected cover leaves no file behind
+    with wave.open(input_path, 'rb') as src:
+        params = src.getparams()
+    if params.comptype != 'NONE':
+        raise ValueError("Only uncompressed PCM WAV files are supported")
+    if len(bits) > params.nframes * params.nchannels:
+        raise ValueError("Message too long for the recording")
+
+    with wave.open(input_path, 'rb') as src, wave.open(output_path, 'wb') as dst:
+        dst.setparams(params)
+
+        offset = 0
+        while True:
+            frames = src.readframes(chunk_frames)
+            if not frames:
+                break
+            if offset < len(bits):
+                buffer = bytearray(frames)
+                plane = np.frombuffer(buffer, dtype=np.uint8)[::params.sampwidth]
+                take = min(plane.size, len(bits) - offset)
+                embed_bits(plane, bits[offset:offset + take],
+                           mask=mask if np.isscalar(mask) else mask[offset:offset + take])
+                offset += take
+                frames = bytes(buffer)
+            dst.writeframes(frames)
+    print(f"[✓] Message encoded into audio and saved to: {output_path}")
+
+def _sample_chunks(wav, chunk_frames):
+    # Starts with small reads so short messages only touch the first frames
+    size = 256
+    while True:
+        frames = wav.readframes(size)
+        if not frames:
+            return
+        yield _low_bytes(frames, wav.getsampwidth())
+        size = min(chunk_frames, size * 4)
+
+def decode_wav(input_path, chunk_frames=CHUNK_FRAMES):
+    with wave.open(input_path, 'rb') as wav:
+        message = LSBStreamReader(_sample_chunks(wav, chunk_frames)).read_payload()
+    print("[✓] Decoded message from WAV:", message)
+    return message
+
+if __name__ == "__main__":
+    choice = input("1. Embed a message\n2. Extract a message\nEnter choice (1 or 2): ")
+    if choice == '1':
+        encode_wav(input("Cover WAV path: "), input("Message: "), input("Output WAV path: "))
+    elif choice == '2':
+        decode_wav(input("Stego WAV path: "))
+    else:
+        print("[ERROR] Invalid choice")
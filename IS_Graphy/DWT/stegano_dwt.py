@@ -1,19 +1,46 @@
 import numpy as np
+import pywt
 from PIL import Image
+from collections import OrderedDict
 import os
 
+# Decoded images keyed by (path, mtime, size), shared by every instance so a
+# long-running process never reloads an unchanged cover
+_image_cache = OrderedDict()
+IMAGE_CACHE_SIZE = 8
+
 class Steganography:
-    def __init__(self):
+    def __init__(self, wavelet='haar', level=2, step=8.0, tile=256):
         self.delimiter = '1111111111111110'
+        # Transform-domain settings: bits are quantized (QIM) into the
+        # LH/HL/HH coefficients of the deepest level, tile by tile
+        self.wavelet = wavelet
+        self.level = level
+        self.step = step
+        self.tile = tile
+        self.max_passes = 8
 
     def load_image(self, path="/home/suboptimal/Steganography/yhpargonagets/IS_Graphy/DWT/apple.png"):
         if not os.path.exists(path):
             raise FileNotFoundError(f"{path} not found")
-        return np.array(Image.open(path).convert('L'), dtype=np.int32)
+        stat = os.stat(path)
+        key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+        if key in _image_cache:
+            _image_cache.move_to_end(key)
+            return _image_cache[key]
+        # Cached arrays are shared, so they are read-only; callers copy
+        img = np.array(Image.open(path).convert('L'), dtype=np.uint8)
+        img.flags.writeable = False
+        _image_cache[key] = img
+        if len(_image_cache) > IMAGE_CACHE_SIZE:
+            _image_cache.popitem(last=False)
+        return img
 
     def save_image(self, image, path="apple_stego.png"):
         path = os.path.splitext(path)[0] + '.png'
-        Image.fromarray(np.clip(image, 0, 255).astype(np.uint8)).save(path)
+        if image.dtype != np.uint8:
+            image = np.clip(image, 0, 255).astype(np.uint8)
+        Image.fromarray(image).save(path)
         return path
 
     def text_to_binary(self, text):
@@ -22,31 +49,121 @@ class Steganography:
         return length_bin + data_bin + self.delimiter
 
     def binary_to_text(self, binary):
-        length = int(binary[:32], 2)
-        return ''.join(chr(int(binary[i:i+8], 2)) for i in range(32, 32 + length * 8, 8))
+        # 32-bit length header then 8 bits per character, as a '0'/'1' string or a bit array
+        bits = self._bit_array(binary) if isinstance(binary, str) else binary
+        length = int.from_bytes(np.packbits(bits[:32]).tobytes(), 'big')
+        return np.packbits(bits[32:32 + length * 8]).tobytes().decode('latin-1')
 
     def embed(self, message, output_path="apple_stego.png"):
         img = self.load_image()
-        data = self.text_to_binary(message)
-        flat = img.flatten()
-        if len(data) > len(flat):
+        bits = self._bit_array(self.text_to_binary(message))
+        stego = img.copy()
+        flat = stego.reshape(-1)
+        if len(bits) > len(flat):
+            raise ValueError("Message too long for the image")
+        # uint8 in place: clear the LSBs, then OR in the message bits
+        flat[:len(bits)] &= 0xFE
+        flat[:len(bits)] |= bits
+        return self.save_image(stego, output_path)
+
+    # ---------- WAVELET DOMAIN ----------
+    def _tiles(self, shape):
+        block = 2 ** self.level
+        tile = min(self.tile, min(shape) // block * block)
+        if tile == 0:
+            raise ValueError("Image too small for the wavelet level")
+        return tile, shape[0] // tile, shape[1] // tile
+
+    def _to_tiles(self, img, tile, nx, count):
+        # First `count` tiles in raster order as one (count, tile, tile) stack
+        stack = np.empty((count, tile, tile), dtype=np.float64)
+        for i in range(count):
+            y, x = divmod(i, nx)
+            stack[i] = img[y * tile:(y + 1) * tile, x * tile:(x + 1) * tile]
+        return stack
+
+    def _from_tiles(self, img, stack, tile, nx):
+        for i, block in enumerate(stack):
+            y, x = divmod(i, nx)
+            img[y * tile:(y + 1) * tile, x * tile:(x + 1) * tile] = block
+
+    def _decompose(self, tiles):
+        coeffs = pywt.wavedec2(tiles, self.wavelet, mode='periodization', level=self.level, axes=(-2, -1))
+        return coeffs, np.stack(coeffs[1], axis=-3)
+
+    def _bit_array(self, binary):
+        return np.frombuffer(binary.encode('ascii'), dtype=np.uint8) - ord('0')
+
+    def _tiles_for(self, n_bits, tile, ny, nx):
+        # Bits fill tiles in raster order, so only the leading tiles are touched
+        per_tile = 3 * (tile >> self.level) ** 2
+        count = -(-n_bits // per_tile)
+        if count > ny * nx:
             raise ValueError("Message too long for the image")
-        for i, bit in enumerate(data):
-            flat[i] = (flat[i] & ~1) | int(bit)
-        return self.save_image(flat.reshape(img.shape), output_path)
+        return count
+
+    def embed_dwt(self, message, output_path="apple_stego.png"):
+        img = self.load_image()
+        bits = self._bit_array(self.text_to_binary(message))
+        tile, ny, nx = self._tiles(img.shape)
+        count = self._tiles_for(len(bits), tile, ny, nx)
+        stego = img.astype(np.float64)
+        tiles = self._to_tiles(stego, tile, nx, count)
+
+        # Rounding back to 8-bit pixels perturbs the coefficients, so the
+        # tiles are re-decomposed and re-quantized until every bit reads back
+        for _ in range(self.max_passes):
+            coeffs, detail = self._decompose(tiles)
+            flat = detail.reshape(-1)[:len(bits)]
+            q = np.round(flat / self.step)
+            wrong = (q.astype(np.int64) & 1) != bits
+            if not wrong.any():
+                break
+            # Move each coefficient to the nearest quantizer cell of the right parity
+            q[wrong] += np.where(flat[wrong] > q[wrong] * self.step, 1, -1)
+            detail.reshape(-1)[:len(bits)] = q * self.step
+            coeffs[1] = tuple(detail[..., i, :, :] for i in range(3))
+            tiles = np.clip(np.round(pywt.waverec2(coeffs, self.wavelet, mode='periodization', axes=(-2, -1))), 0, 255)
+        else:
+            raise ValueError("Could not embed the message exactly; try a larger step")
+        self._from_tiles(stego, tiles, tile, nx)
+        return self.save_image(stego, output_path)
+
+    def _read_dwt_bits(self, img, tile, ny, nx, start, count):
+        _, detail = self._decompose(self._to_tiles(img, tile, nx, self._tiles_for(start + count, tile, ny, nx)))
+        flat = detail.reshape(-1)[start:start + count]
+        return (np.round(flat / self.step).astype(np.int64) & 1).astype(np.uint8)
+
+    def extract_dwt(self, path="apple_stego.png"):
+        img = self.load_image(path)
+        tile, ny, nx = self._tiles(img.shape)
+        # Header first, then exactly the tiles holding the stated length
+        header = self._read_dwt_bits(img, tile, ny, nx, 0, 32)
+        length = int(''.join(map(str, header)), 2)
+        try:
+            bits = self._read_dwt_bits(img, tile, ny, nx, 32, length * 8)
+        except ValueError:
+            return "[ERROR] No wavelet-domain message found"
+        return self.binary_to_text(np.concatenate([header, bits]))
 
     def extract(self):
-        img = self.load_image("apple_stego.png").flatten()
-        bits = ''.join(str(p & 1) for p in img)
-        end = bits.find(self.delimiter)
-        return self.binary_to_text(bits[:end]) if end != -1 else "[ERROR] Delimiter not found"
+        flat = self.load_image("apple_stego.png").reshape(-1)
+        # 32-bit length header, then exactly 8 bits per character
+        length = int(''.join(map(str, flat[:32] & 1)), 2)
+        end = 32 + length * 8
+        delimiter = self._bit_array(self.delimiter)
+        if end + len(delimiter) > flat.size or not np.array_equal(flat[end:end + len(delimiter)] & 1, delimiter):
+            return "[ERROR] Delimiter not found"
+        return self.binary_to_text(flat[:end] & 1)
 
 def switch_case():
     steg = Steganography()
     print("\n--- Steganography on apple.png ---")
     print("1. Embed a message")
     print("2. Extract a message")
-    choice = input("Enter choice (1 or 2): ")
+    print("3. Embed a message (wavelet domain)")
+    print("4. Extract a message (wavelet domain)")
+    choice = input("Enter choice (1-4): ")
 
     if choice == '1':
         msg = input("Enter the message to embed: ")
@@ -62,6 +179,20 @@ def switch_case():
             print(f"[MESSAGE EXTRACTED] {msg}")
         except Exception as e:
             print(f"[ERROR] {e}")
+    elif choice == '3':
+        msg = input("Enter the message to embed: ")
+        try:
+            out = steg.embed_dwt(msg)
+            print(f"[SUCCESS] Message embedded in {out}")
+        except Exception as e:
+            print(f"[ERROR] {e}")
+
+    elif choice == '4':
+        try:
+            msg = steg.extract_dwt()
+            print(f"[MESSAGE EXTRACTED] {msg}")
+        except Exception as e:
+            print(f"[ERROR] {e}")
     else:
         print("[ERROR] Invalid choice")
 
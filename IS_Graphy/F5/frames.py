@@ -0,0 +1,77 @@
+from PIL import Image, ImageSequence
+import numpy as np
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "LSB"))
+from bitplane import message_to_bits, lsb_plane, embed_bits, LSBStreamReader
+
+# LSB encoding over multi-frame carriers: animated GIF/APNG/TIFF files or a
+# directory of numbered frames. Frames are pulled lazily one at a time, take
+# their share of the payload as they stream past and are written out at
+# once, so memory stays at one frame however long the sequence is.
+# Stego frames are saved as a numbered PNG sequence. Re-encoding to GIF would
+# re-quantize the palette and destroy the LSBs, and PIL buffers every frame
+# when it writes an APNG.
+
+FRAME_EXTENSIONS = ('.png', '.bmp', '.tif', '.tiff')
+
+def iter_frames(source):
+    if os.path.isdir(source):
+        for name in sorted(os.listdir(source)):
+            if name.lower().endswith(FRAME_EXTENSIONS):
+                with Image.open(os.path.join(source, name)) as frame:
+                    yield np.array(frame.convert('RGB'))
+    else:
+        with Image.open(source) as img:
+            for frame in ImageSequence.Iterator(img):
+                yield np.array(frame.convert('RGB'))
+
+def frame_sizes(source):
+    # (width, height) of every frame, from the headers only; no pixel data is decoded
+    if os.path.isdir(source):
+        for name in sorted(os.listdir(source)):
+            if name.lower().endswith(FRAME_EXTENSIONS):
+                with Image.open(os.path.join(source, name)) as frame:
+                    yield frame.size
+    else:
+        with Image.open(source) as img:
+            for index in range(getattr(img, 'n_frames', 1)):
+                img.seek(index)
+                yield img.size
+
+def encode_frames(source, message, output_dir, compress_level=6):
+    bits = message_to_bits(message)  # Adds end of message delimiter
+    # Check the capacity before anything is written, so a message that does
+    # not fit never leaves a partial sequence in output_dir
+    sizes = list(frame_sizes(source))
+    if len(bits) > sum(3 * w * h for w, h in sizes):
+        raise ValueError(f"Message too long for the {len(sizes)} frames in {source}")
+    os.makedirs(output_dir, exist_ok=True)
+
+    offset = count = 0
+    for count, frame in enumerate(iter_frames(source), start=1):
+        if offset < len(bits):
+            plane = lsb_plane(frame)
+            take = min(plane.size, len(bits) - offset)
+            embed_bits(plane, bits[offset:offset + take])
+            offset += take
+        Image.fromarray(frame).save(os.path.join(output_dir, f"frame_{count:05d}.png"),
+                                    compress_level=compress_level)
+    print(f"[✓] Message encoded across {count} frames and saved to: {output_dir}")
+
+def decode_frames(source):
+    # Stops pulling frames as soon as the null character is reached
+    message = LSBStreamReader(iter_frames(source)).read_message()
+    print("[✓] Decoded message from frame sequence:", message)
+    return message
+
+if __name__ == "__main__":
+    choice = input("1. Embed a message\n2. Extract a message\nEnter choice (1 or 2): ")
+    if choice == '1':
+        encode_frames(input("GIF/APNG file or frame directory: "), input("Message: "),
+                      input("Output directory: "))
+    elif choice == '2':
+        decode_frames(input("Stego frame directory: "))
+    else:
+        print("[ERROR] Invalid choice")
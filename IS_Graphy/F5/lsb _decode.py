@@ -1,31 +1,20 @@
-from PIL import Image
+import os
+import sys
 
-def decode_image(image_path):
-    img = Image.open(image_path)
-    binary_data = ""
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "LSB"))
+from scatter import open_reader
 
-    for y in range(img.height):
-        for x in range(img.width):
-            r, g, b = img.getpixel((x, y))
-            binary_data += str(r & 1)
-            binary_data += str(g & 1)
-            binary_data += str(b & 1)
-
-    # Split binary string into 8-bit chunks
-    chars = [binary_data[i:i+8] for i in range(0, len(binary_data), 8)]
-
-    # Convert to characters until null character is found
-    message = ""
-    for char in chars:
-        decoded_char = chr(int(char, 2))
-        if decoded_char == chr(0):  # End of message
-            break
-        message += decoded_char
+def decode_image(image_path, key=None):
+    # Decoding stops at the null character, so without a key only the rows
+    # that hold the message are ever decoded
+    message = open_reader(image_path, key).read_message()
 
     print("[✓] Decoded message:", message)
+    return message
 
-# Path to the stego image
-stego_image_path = r"C:\cod\yhpargonagets\IS_Graphy\F5\apple_stego.png"
+if __name__ == "__main__":
+    # Path to the stego image
+    stego_image_path = r"C:\cod\yhpargonagets\IS_Graphy\F5\apple_stego.png"
 
-# Run the decoder
-decode_image(stego_image_path)
+    # Run the decoder
+    decode_image(stego_image_path)
@@ -1,44 +1,42 @@
 from PIL import Image
+import numpy as np
 import os
+import sys
 
-# LSB encode function
-def encode_image(image_path, message, output_path):
-    img = Image.open(image_path)
-    encoded = img.copy()
-    width, height = img.size
-    message += chr(0)  # Add end of message delimiter
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "LSB"))
+from bitplane import message_to_bits, lsb_plane, embed_bits
+from streaming import embed_stream
+from scatter import check_streamable, embed_scattered
 
-    data_index = 0
-    binary_message = ''.join(format(ord(char), '08b') for char in message)
+# LSB encode function
+def encode_image(image_path, message, output_path, stream=False, key=None):
+    bits = message_to_bits(message)  # Adds end of message delimiter
 
-    for y in range(height):
-        for x in range(width):
-            if data_index >= len(binary_message):
-                break
-            r, g, b = img.getpixel((x, y))
-            r = (r & ~1) | int(binary_message[data_index])
-            data_index += 1
-            if data_index < len(binary_message):
-                g = (g & ~1) | int(binary_message[data_index])
-                data_index += 1
-            if data_index < len(binary_message):
-                b = (b & ~1) | int(binary_message[data_index])
-                data_index += 1
-            encoded.putpixel((x, y), (r, g, b))
-        if data_index >= len(binary_message):
-            break
+    check_streamable(stream, key)
 
-    encoded.save(output_path)
+    if stream:
+        embed_stream(image_path, output_path, bits)
+    else:
+        img = Image.open(image_path)
+        if img.mode != 'RGB':
+            img = img.convert('RGB')
+        encoded = np.array(img)
+        if key is None:
+            embed_bits(lsb_plane(encoded), bits)
+        else:
+            embed_scattered(lsb_plane(encoded), bits, key)
+        Image.fromarray(encoded).save(output_path)
     print(f"[✓] Message encoded and saved to: {output_path}")
 
-# Paths
-input_image_path = r"C:\cod\yhpargonagets\IS_Graphy\apple.jpg"
-output_dir = r"C:\cod\yhpargonagets\IS_Graphy\F5"
-os.makedirs(output_dir, exist_ok=True)
-output_image_path = os.path.join(output_dir, "apple_stego.png")
+if __name__ == "__main__":
+    # Paths
+    input_image_path = r"C:\cod\yhpargonagets\IS_Graphy\apple.jpg"
+    output_dir = r"C:\cod\yhpargonagets\IS_Graphy\F5"
+    os.makedirs(output_dir, exist_ok=True)
+    output_image_path = os.path.join(output_dir, "apple_stego.png")
 
-# Message
-secret_message = "Sulagna"
+    # Message
+    secret_message = "Sulagna"
 
-# Encode
-encode_image(input_image_path, secret_message, output_image_path)
+    # Encode
+    encode_image(input_image_path, secret_message, output_image_path)
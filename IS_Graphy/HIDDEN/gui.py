@@ -1,8 +1,10 @@
 import tkinter as tk
 from tkinter import filedialog, messagebox
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image
 import pytesseract
 import os
+from textmask import alpha_band_mask, crop_to_mask, mask_to_image
+from overlay import overlay_text
 
 # Set your Tesseract path
 pytesseract.pytesseract.tesseract_cmd = r"C:\Program Files\Tesseract-OCR\tesseract.exe"
@@ -18,17 +20,7 @@ def hide_message():
         return
 
     image = Image.open(filepath).convert("RGBA")
-    txt_layer = Image.new("RGBA", image.size, (255, 255, 255, 0))
-    draw = ImageDraw.Draw(txt_layer)
-
-    try:
-        font = ImageFont.truetype("arial.ttf", 24)
-    except:
-        font = ImageFont.load_default()
-
-    draw.text((50, 50), message, font=font, fill=(255, 255, 255, 100))  # Visible but subtle
-
-    result = Image.alpha_composite(image, txt_layer)
+    result, _, _ = overlay_text(image, message, (50, 50), "arial.ttf", 24, (255, 255, 255, 100))  # Visible but subtle
 
     save_path = filedialog.asksaveasfilename(defaultextension=".png", filetypes=[("PNG Files", "*.png")])
     if save_path:
@@ -41,19 +33,8 @@ def extract_message():
     if not filepath:
         return
 
-    image = Image.open(filepath).convert("RGBA")
-    width, height = image.size
-    extracted = Image.new("RGBA", (width, height))
-
-    for x in range(width):
-        for y in range(height):
-            r, g, b, a = image.getpixel((x, y))
-            if 90 <= a <= 120:
-                extracted.putpixel((x, y), (255, 255, 255, 255))
-            else:
-                extracted.putpixel((x, y), (0, 0, 0, 255))
-
-    gray = extracted.convert("L")
+    # Semi-transparent text band (alpha 90-120) as white on black, cropped to the text
+    gray = mask_to_image(crop_to_mask(alpha_band_mask(Image.open(filepath), 90, 120)))
     gray.save("extracted_hidden_text.png")
 
     text = pytesseract.image_to_string(gray, config='--psm 6').strip()
@@ -1,7 +1,8 @@
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image
 import pytesseract
-import numpy as np
 import os
+from textmask import crop_to_mask, load_mask, mask_to_image, save_mask
+from overlay import overlay_mask, overlay_text
 
 # === Tesseract OCR Path ===
 pytesseract.pytesseract.tesseract_cmd = r"C:\Program Files\Tesseract-OCR\tesseract.exe"
@@ -17,46 +18,24 @@ HELPER_MASK = os.path.join(HIDDEN_DIR, "hidden_mask.npy")
 
 def hide_message(input_path, output_path, message):
     image = Image.open(input_path).convert("RGBA")
-    txt_layer = Image.new("RGBA", image.size, (255, 255, 255, 0))
-    draw = ImageDraw.Draw(txt_layer)
 
-    # Font
-    try:
-        font = ImageFont.truetype("arialbd.ttf", 50)
-    except:
-        font = ImageFont.load_default()
+    # Full white text; only the text's own box is composited
+    _, position, strip = overlay_text(image, message, (50, 50), "arialbd.ttf", 50, (255, 255, 255, 255))
 
-    x, y = 50, 50
-    draw.text((x, y), message, font=font, fill=(255, 255, 255, 255))  # Full white text
+    # Save mask where text was drawn (bounding box + packed bits)
+    save_mask(HELPER_MASK, overlay_mask(image.size, strip, position, 200))  # alpha > 200 indicates text
 
-    # Save mask where text was drawn
-    mask = np.array(txt_layer)[:, :, 3] > 200  # alpha > 200 indicates text
-    np.save(HELPER_MASK, mask)
-
-    # Merge and save
-    result = Image.alpha_composite(image, txt_layer)
     os.makedirs(HIDDEN_DIR, exist_ok=True)
-    result.save(output_path)
+    image.save(output_path)
     print(f"[✅] Message hidden in: {output_path}")
     print(f"[📁] Mask saved in: {HELPER_MASK}")
 
 def extract_hidden_message(image_path, mask_path):
-    image = Image.open(image_path).convert("RGBA")
-    rgba = np.array(image)
-    mask = np.load(mask_path)
-
-    # Apply mask to extract only where text was hidden
-    extracted = np.zeros_like(rgba)
-    extracted[mask] = [255, 255, 255, 255]  # Text in white
-    extracted[~mask] = [0, 0, 0, 255]       # Background in black
-
-    # Convert to PIL and grayscale
-    extracted_image = Image.fromarray(extracted, 'RGBA')
-    gray = extracted_image.convert("L")
-    thresholded = gray.point(lambda p: 255 if p > 100 else 0)
+    mask = load_mask(mask_path)  # compact or legacy full-size sidecar
 
-    # Save debug images
-    thresholded.save(DEBUG_IMAGE)
+    # Text in white, background in black; the OCR input is cropped to the text
+    mask_to_image(mask.toarray()).save(DEBUG_IMAGE)
+    thresholded = mask_to_image(crop_to_mask(mask))
     thresholded.save(CROPPED_IMAGE)
 
     print("[💾] Extracted text image saved.")
@@ -0,0 +1,95 @@
+import argparse
+import json
+import os
+import sys
+from PIL import Image
+from textmask import alpha_band_mask, crop_to_mask, load_mask, mask_bbox, mask_to_image
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "LSB"))
+from jobpool import LOSSLESS_EXTENSIONS, image_files, run_jobs
+
+# Batch OCR for HIDDEN text recovery. Each image is reduced to the text
+# region first (from a saved mask or the alpha band) and scaled down to a
+# target glyph height, so tesseract never reads a mostly black canvas. A pool
+# of worker processes keeps one OCR engine each alive between images:
+# tesserocr's in-process API when it is installed, otherwise pytesseract
+# (which still starts tesseract per image, but in parallel).
+
+WINDOWS_TESSERACT = r"C:\Program Files\Tesseract-OCR\tesseract.exe"
+GLYPH_HEIGHT = 32
+
+# ---------- PREPROCESSING ----------
+def load_text_mask(image_path, mask_path=None, low=90, high=120):
+    if mask_path:
+        return load_mask(mask_path)
+    return alpha_band_mask(Image.open(image_path), low, high)
+
+def prepare_for_ocr(mask, glyph_height=GLYPH_HEIGHT, pad=10):
+    # Crop to the text and shrink so a line is about glyph_height pixels
+    # tall (never enlarged); the margin scales with it.
+    if mask_bbox(mask) is None:
+        return None
+    region = crop_to_mask(mask, 0)
+    text = mask_to_image(region)
+    scale = min(1.0, glyph_height / region.shape[0])
+    if scale < 1.0:
+        size = (max(1, round(text.width * scale)), max(1, round(text.height * scale)))
+        text = text.resize(size, Image.LANCZOS)
+    margin = max(2, round(pad * scale))
+    canvas = Image.new('L', (text.width + 2 * margin, text.height + 2 * margin), 0)
+    canvas.paste(text, (margin, margin))
+    return canvas
+
+# ---------- WORKERS ----------
+_engine = None
+
+def _start_engine(psm):
+    global _engine
+    try:
+        import tesserocr
+        api = tesserocr.PyTessBaseAPI(psm=psm)
+
+        def read(image):
+            api.SetImage(image)
+            return api.GetUTF8Text()
+        _engine = read
+    except ImportError:
+        import pytesseract
+        if os.path.exists(WINDOWS_TESSERACT):
+            pytesseract.pytesseract.tesseract_cmd = WINDOWS_TESSERACT
+        _engine = lambda image: pytesseract.image_to_string(image, config=f'--psm {psm}')
+
+def _ocr_job(image_path, mask_path, glyph_height):
+    prepared = prepare_for_ocr(load_text_mask(image_path, mask_path), glyph_height)
+    return {"text": _engine(prepared).strip() if prepared is not None else ""}
+
+# ---------- BATCH ----------
+def ocr_images(image_paths, mask_path=None, workers=None, psm=7, glyph_height=GLYPH_HEIGHT, queue_size=None):
+    # Images are fed to the pool with at most queue_size in flight; results
+    # come back in completion order.
+    workers = workers or os.cpu_count() or 1
+    jobs = ((_ocr_job, (path, mask_path, glyph_height), {"image": path, "text": ""}) for path in image_paths)
+    return run_jobs(jobs, workers, queue_size or 4 * workers, done="images read", unit="images",
+                    initializer=_start_engine, initargs=(psm,))
+
+def ocr_directory(folder, mask_path=None, **kwargs):
+    # JPEG would lose the alpha band the text is hidden in
+    return ocr_images(image_files(folder, LOSSLESS_EXTENSIONS), mask_path, **kwargs)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="OCR the hidden text of every image in a directory")
+    parser.add_argument("folder", help="Directory of watermarked images")
+    parser.add_argument("--mask", help="hidden_mask.npy shared by the images (default: alpha band)")
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--psm", type=int, default=7, help="Tesseract page segmentation mode")
+    parser.add_argument("--glyph-height", type=int, default=GLYPH_HEIGHT)
+    parser.add_argument("--report", help="Write per-image text, timings and failures to this JSON file")
+    args = parser.parse_args()
+
+    results = ocr_directory(args.folder, args.mask, workers=args.workers, psm=args.psm,
+                            glyph_height=args.glyph_height)
+    for r in sorted(results, key=lambda r: r["image"]):
+        print(f"{r['image']}: {r['error'] or r['text']}")
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump(results, f, indent=4)
@@ -0,0 +1,101 @@
+import argparse
+import os
+import sys
+from functools import lru_cache
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+from textmask import CompactMask
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "LSB"))
+from jobpool import image_files, run_jobs
+
+# Text overlays for the HIDDEN / ISGAN scripts. Fonts and rendered text
+# strips are cached per process, and a strip is composited onto the cover only
+# over its own bounding box, so no full-size text layer is ever allocated.
+# Negative positions count from the right / bottom edge.
+
+@lru_cache(maxsize=32)
+def load_font(name, size):
+    try:
+        return ImageFont.truetype(name, size)
+    except OSError:
+        return ImageFont.load_default()
+
+@lru_cache(maxsize=256)
+def text_strip(message, font_name, size, fill):
+    # RGBA image of just the rendered text and its offset from the draw origin
+    font = load_font(font_name, size)
+    left, top, right, bottom = ImageDraw.Draw(Image.new("RGBA", (1, 1))).textbbox((0, 0), message, font=font)
+    strip = Image.new("RGBA", (max(1, right - left), max(1, bottom - top)), (255, 255, 255, 0))
+    ImageDraw.Draw(strip).text((-left, -top), message, font=font, fill=fill)
+    return strip, (left, top)
+
+def _place(image_size, offset, xy):
+    x, y = xy
+    x = image_size[0] + x if x < 0 else x
+    y = image_size[1] + y if y < 0 else y
+    return x + offset[0], y + offset[1]
+
+def overlay_text(image, message, xy=(50, 50), font_name="arial.ttf", size=24, fill=(255, 255, 255, 255)):
+    # Composites the text onto image (RGBA) in place and returns
+    # (image, (x, y), strip) with the strip's top-left corner on the image.
+    strip, offset = text_strip(message, font_name, size, tuple(fill))
+    x, y = _place(image.size, offset, xy)
+    # Clip the strip to the image; alpha_composite wants a non-negative dest
+    sx, sy = max(0, -x), max(0, -y)
+    if sx < strip.width and sy < strip.height and x + strip.width > 0 and y + strip.height > 0:
+        image.alpha_composite(strip, dest=(x + sx, y + sy), source=(sx, sy))
+    return image, (x, y), strip
+
+def overlay_mask(image_size, strip, position, threshold=200):
+    # CompactMask of the pixels where the strip's alpha exceeds threshold
+    width, height = image_size
+    x, y = position
+    region = np.asarray(strip.getchannel("A")) > threshold
+    # Only the part of the strip that lands on the image
+    top, left = max(0, -y), max(0, -x)
+    region = region[top:max(top, height - y), left:max(left, width - x)]
+    compact = CompactMask.from_dense(region)
+    t, b, l, r = compact.box
+    if b == t:
+        return CompactMask((height, width), (0, 0, 0, 0), compact._packed)
+    oy, ox = y + top, x + left
+    return CompactMask((height, width), (oy + t, oy + b, ox + l, ox + r), compact._packed)
+
+def hide_text(input_path, output_path, message, **style):
+    image = Image.open(input_path).convert("RGBA")
+    overlay_text(image, message, **style)
+    image.save(output_path, format="PNG")
+    return output_path
+
+# ---------- BATCH ----------
+def _overlay_job(cover, output, message, style):
+    hide_text(cover, output, message, **style)
+
+def _report_failure(result):
+    if result["error"]:
+        print(f"[✗] {result['cover']}: {result['error']}")
+
+def overlay_directory(cover_dir, output_dir, message, workers=None, queue_size=None, **style):
+    os.makedirs(output_dir, exist_ok=True)
+    jobs = []
+    for cover in image_files(cover_dir):
+        output = os.path.join(output_dir, os.path.splitext(os.path.basename(cover))[0] + "_hidden.png")
+        jobs.append((_overlay_job, (cover, output, message, style), {"cover": cover, "output": output}))
+    return run_jobs(jobs, workers, queue_size, report=_report_failure, done="covers done", unit="images")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Overlay hidden text on every cover in a directory")
+    parser.add_argument("covers", help="Directory of cover images")
+    parser.add_argument("output", help="Output directory")
+    parser.add_argument("message")
+    parser.add_argument("--x", type=int, default=50, help="Negative values count from the right edge")
+    parser.add_argument("--y", type=int, default=50, help="Negative values count from the bottom edge")
+    parser.add_argument("--font", default="arial.ttf")
+    parser.add_argument("--size", type=int, default=24)
+    parser.add_argument("--alpha", type=int, default=100, help="Text alpha (0-255)")
+    parser.add_argument("--workers", type=int)
+    args = parser.parse_args()
+
+    overlay_directory(args.covers, args.output, args.message, args.workers, xy=(args.x, args.y),
+                      font_name=args.font, size=args.size, fill=(255, 255, 255, args.alpha))
@@ -0,0 +1,118 @@
+import numpy as np
+from PIL import Image
+
+# Mask helpers for the HIDDEN text scripts. Masks are boolean arrays (True
+# where text was drawn); everything here is vectorized so a 4K image is
+# thresholded and cropped in milliseconds.
+
+def alpha_channel(image):
+    # Alpha plane of a PIL image or an RGBA array, as a contiguous uint8 array
+    if isinstance(image, Image.Image):
+        if image.mode not in ("RGBA", "LA"):
+            image = image.convert("RGBA")
+        return np.asarray(image.getchannel("A"))
+    return np.ascontiguousarray(np.asarray(image)[..., 3], dtype=np.uint8)
+
+def alpha_band_mask(image, low=90, high=120):
+    # Pixels whose alpha lies in [low, high], i.e. the semi-transparent text.
+    # uint8 wrap-around turns the range test into a single comparison.
+    alpha = alpha_channel(image)
+    return (alpha - np.uint8(low)) <= np.uint8(high - low)
+
+def mask_bbox(mask, pad=0):
+    # (top, bottom, left, right) of the True pixels grown by pad, or None
+    if isinstance(mask, CompactMask):
+        return mask.bbox(pad)
+    rows = np.flatnonzero(mask.any(axis=1))
+    if rows.size == 0:
+        return None
+    cols = np.flatnonzero(mask.any(axis=0))
+    h, w = mask.shape
+    return (max(0, rows[0] - pad), min(h, rows[-1] + 1 + pad),
+            max(0, cols[0] - pad), min(w, cols[-1] + 1 + pad))
+
+def crop_to_mask(mask, pad=10):
+    if isinstance(mask, CompactMask):
+        return mask.crop(pad)
+    box = mask_bbox(mask, pad)
+    if box is None:
+        return mask
+    top, bottom, left, right = box
+    return mask[top:bottom, left:right]
+
+def mask_to_image(mask):
+    # White text on black, 8-bit grayscale
+    return Image.fromarray(np.multiply(mask, 255, dtype=np.uint8), 'L')
+
+# ---------- COMPACT SIDECAR ----------
+# hidden_mask.npy used to be the full boolean mask, one byte per pixel. The
+# compact form is still a single .npy (uint8) so it loads memory-mapped:
+#   MASK_HEADER uint32 fields | rows of the bounding box, np.packbits'ed
+# Only the bounding box is ever unpacked; full-size masks are built on demand.
+
+MASK_MAGIC = 0x4B53414D  # b'MASK'
+MASK_VERSION = 1
+MASK_HEADER = 8  # magic, version, height, width, top, bottom, left, right
+
+class CompactMask:
+    def __init__(self, shape, box, packed):
+        self.shape = shape
+        self.box = box  # (top, bottom, left, right), empty when no text
+        self._packed = packed
+        self._region = None
+
+    @classmethod
+    def from_dense(cls, mask):
+        mask = np.asarray(mask, dtype=bool)
+        box = mask_bbox(mask) or (0, 0, 0, 0)
+        top, bottom, left, right = box
+        return cls(mask.shape, box, np.packbits(mask[top:bottom, left:right], axis=1))
+
+    def region(self):
+        # Mask inside the bounding box, unpacked on first use
+        if self._region is None:
+            top, bottom, left, right = self.box
+            self._region = np.unpackbits(self._packed, axis=1, count=right - left).astype(bool)
+        return self._region
+
+    def bbox(self, pad=0):
+        top, bottom, left, right = self.box
+        if bottom == top:
+            return None
+        h, w = self.shape
+        return max(0, top - pad), min(h, bottom + pad), max(0, left - pad), min(w, right + pad)
+
+    def crop(self, pad=10):
+        box = self.bbox(pad)
+        if box is None:
+            return self.toarray()
+        top, bottom, left, right = box
+        t, b, l, r = self.box
+        return np.pad(self.region(), ((t - top, bottom - b), (l - left, right - r)))
+
+    def toarray(self):
+        mask = np.zeros(self.shape, dtype=bool)
+        top, bottom, left, right = self.box
+        mask[top:bottom, left:right] = self.region()
+        return mask
+
+    def __array__(self, dtype=None, copy=None):
+        mask = self.toarray()
+        return mask if dtype is None else mask.astype(dtype)
+
+def save_mask(path, mask):
+    compact = mask if isinstance(mask, CompactMask) else CompactMask.from_dense(mask)
+    header = np.array([MASK_MAGIC, MASK_VERSION, *compact.shape, *compact.box], dtype='<u4')
+    np.save(path, np.concatenate([header.view(np.uint8), np.asarray(compact._packed).ravel()]))
+
+def load_mask(path):
+    # Compact sidecars and legacy full-resolution boolean masks
+    data = np.load(path, mmap_mode='r')
+    if data.dtype == bool:
+        return CompactMask.from_dense(data)
+    header = np.frombuffer(data[:MASK_HEADER * 4].tobytes(), dtype='<u4')
+    magic, version, height, width, top, bottom, left, right = (int(v) for v in header)
+    if magic != MASK_MAGIC or version != MASK_VERSION:
+        raise ValueError(f"{path} is not a text mask")
+    packed = data[MASK_HEADER * 4:].reshape(bottom - top, -1) if bottom > top else np.zeros((0, 0), np.uint8)
+    return CompactMask((height, width), (top, bottom, left, right), packed)
@@ -1,28 +1,17 @@
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image
 import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "HIDDEN"))
+from overlay import overlay_text
 
 def hide_message(input_path, output_path, message):
     # Load the original image
     image = Image.open(input_path).convert("RGBA")
 
-    # Create a transparent layer same size as the original
-    txt_layer = Image.new("RGBA", image.size, (255,255,255,0))
-    draw = ImageDraw.Draw(txt_layer)
-
-    # Choose a font and size
-    try:
-        font = ImageFont.truetype("arial.ttf", 1)  # Small invisible font
-    except:
-        font = ImageFont.load_default()
-
-    # Position to hide the message (e.g., bottom-right)
-    x, y = image.size[0] - 100, image.size[1] - 30
-
-    # Draw the text in nearly invisible color (alpha = 1)
-    draw.text((x, y), message, font=font, fill=(0, 0, 0, 1))
-
-    # Combine image and transparent message layer
-    hidden_image = Image.alpha_composite(image, txt_layer)
+    # Small invisible font, bottom-right, nearly invisible color (alpha = 1);
+    # only the text's own box is composited
+    hidden_image, _, _ = overlay_text(image, message, (-100, -30), "arial.ttf", 1, (0, 0, 0, 1))
 
     # Save final image
     os.makedirs(os.path.dirname(output_path), exist_ok=True)
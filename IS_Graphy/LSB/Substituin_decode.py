@@ -1,22 +1,9 @@
-from PIL import Image
-
-def decode_red_channel():
-    input_path = r"D:\Debayan\yhpargonagets\IS_Graphy\LSB\basic_encoded.png"
-    img = Image.open(input_path)
-    pixels = img.load()
-
-    bits = ''
-    for y in range(img.height):
-        for x in range(img.width):
-            r, g, b = pixels[x, y]
-            bits += str(r & 1)
-
-    chars = [bits[i:i+8] for i in range(0, len(bits), 8)]
-    msg = ''
-    for b in chars:
-        if int(b, 2) == 0: break  # Null terminator
-        msg += chr(int(b, 2))
+from scatter import open_reader
 
+def decode_red_channel(input_path=r"D:\Debayan\yhpargonagets\IS_Graphy\LSB\basic_encoded.png", key=None):
+    msg = open_reader(input_path, key, channel=0).read_message()
     print("[+] Decoded from red channel:", msg)
+    return msg
 
-decode_red_channel()
+if __name__ == "__main__":
+    decode_red_channel()
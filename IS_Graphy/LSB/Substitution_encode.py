@@ -1,30 +1,32 @@
 from PIL import Image
+import numpy as np
+from bitplane import encode_pixels, message_to_bits, lsb_plane
+from scatter import check_streamable, embed_scattered
+from streaming import embed_stream
 
-def to_binary(msg):
-    return ''.join(format(ord(c), '08b') for c in msg)
+def encode_red_channel(input_path=r"IS_Graphy\apple.png",
+                       output_path=r"D:\Debayan\yhpargonagets\IS_Graphy\LSB\basic_encoded.png",
+                       message="my name is debayan", stream=False, key=None):
+    check_streamable(stream, key)
 
-def encode_red_channel():
-    input_path = r"IS_Graphy\apple.png"
-    output_path = r"D:\Debayan\yhpargonagets\IS_Graphy\LSB\basic_encoded.png"
-    message = "my name is debayan" + chr(0)  # Null terminator
+    if stream:
+        embed_stream(input_path, output_path, message_to_bits(message), channel=0)
+        print("[+] Red channel encoding done:", output_path)
+        return
 
     img = Image.open(input_path)
     if img.mode != 'RGB':
         img = img.convert('RGB')
-    pixels = img.load()
+    pixels = np.array(img)
 
-    bin_msg = to_binary(message)
-    idx = 0
-    for y in range(img.height):
-        for x in range(img.width):
-            if idx >= len(bin_msg): break
-            r, g, b = pixels[x, y]
-            r = (r & ~1) | int(bin_msg[idx])
-            pixels[x, y] = (r, g, b)
-            idx += 1
-        if idx >= len(bin_msg): break
+    # Null terminator is appended by the codec; bits go into the red plane only
+    if key is None:
+        encode_pixels(pixels, message, channel=0)
+    else:
+        embed_scattered(lsb_plane(pixels, 0), message_to_bits(message), key)
 
-    img.save(output_path)
+    Image.fromarray(pixels).save(output_path)
     print("[+] Red channel encoding done:", output_path)
 
-encode_red_channel()
+if __name__ == "__main__":
+    encode_red_channel()
@@ -0,0 +1,77 @@
+import argparse
+import csv
+import json
+import os
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+for folder in ("UDH", "F5"):
+    sys.path.append(os.path.join(HERE, "..", folder))
+
+from jobpool import image_files, run_jobs
+
+# ---------- JOB RUNNER ----------
+def _encoder(method):
+    if method == 'udh':
+        from lib import encode_udh
+        return encode_udh
+    if method == 'f5':
+        from lsb import encode_image
+        return encode_image
+    if method == 'red':
+        from Substitution_encode import encode_red_channel
+        return lambda cover, message, output: encode_red_channel(cover, output, message)
+    raise ValueError(f"Unknown method: {method}")
+
+def _run_job(method, cover, message, output):
+    _encoder(method)(cover, message, output)
+
+# ---------- JOB SOURCES ----------
+def jobs_from_directory(cover_dir, message, output_dir):
+    os.makedirs(output_dir, exist_ok=True)
+    for cover in image_files(cover_dir):
+        stem = os.path.splitext(os.path.basename(cover))[0]
+        yield cover, message, os.path.join(output_dir, stem + "_stego.png")
+
+def jobs_from_manifest(manifest_path):
+    # CSV with cover,message,output columns, or a JSON list of such objects
+    with open(manifest_path, newline='', encoding='utf-8') as f:
+        rows = json.load(f) if manifest_path.endswith('.json') else list(csv.DictReader(f))
+    for row in rows:
+        yield row["cover"], row["message"], row["output"]
+
+# ---------- BATCH ----------
+def run_batch(jobs, method='udh', workers=None, queue_size=None):
+    # At most queue_size jobs are in flight, so huge directories never pile
+    # up pending work (or pickled arguments) inside the pool.
+    return run_jobs(((_run_job, (method, cover, message, output), {"cover": cover, "output": output})
+                     for cover, message, output in jobs), workers, queue_size, report=_report)
+
+def _report(result):
+    if result["error"]:
+        print(f"[✗] {result['cover']} failed after {result['seconds']:.2f}s: {result['error']}")
+    else:
+        print(f"[✓] {result['cover']} -> {result['output']} in {result['seconds']:.2f}s")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Batch LSB embedding over a process pool")
+    parser.add_argument("--method", choices=["udh", "f5", "red"], default="udh")
+    parser.add_argument("--manifest", help="CSV/JSON manifest of cover,message,output jobs")
+    parser.add_argument("--covers", help="Directory of cover images")
+    parser.add_argument("--message", help="Message embedded into every cover (with --covers)")
+    parser.add_argument("--output", help="Output directory (with --covers)")
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--report", help="Write per-job timings and failures to this JSON file")
+    args = parser.parse_args()
+
+    if args.manifest:
+        jobs = jobs_from_manifest(args.manifest)
+    elif args.covers and args.message is not None and args.output:
+        jobs = jobs_from_directory(args.covers, args.message, args.output)
+    else:
+        parser.error("Give either --manifest or --covers, --message and --output")
+
+    results = run_batch(jobs, args.method, args.workers)
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump(results, f, indent=4)
@@ -0,0 +1,169 @@
+import numpy as np
+
+# Shared LSB bit codec used by the spatial-domain scripts (LSB, F5, UDH).
+# Messages are stored as 8-bit characters followed by chr(0), exactly like
+# the original per-pixel loops, so older stego images still decode.
+#
+# The k-LSB variant starts with a 9-byte header written 1 bit per sample:
+# MAGIC, the bits per sample k, and the payload length as a big-endian uint32.
+# The payload follows at k bits per sample, with no terminator. MAGIC starts
+# with chr(0), so a terminator decoder reads a header image as an empty
+# message instead of garbage.
+
+TERMINATOR = 0
+MAGIC = b'\x00UDH'
+HEADER_BYTES = len(MAGIC) + 5
+HEADER_BITS = HEADER_BYTES * 8
+MAX_BITS_PER_SAMPLE = 4
+
+# ---------- BIT PACKING ----------
+def message_to_bits(message, terminator=True):
+    data = message.encode('latin-1')
+    if terminator:
+        data += bytes([TERMINATOR])
+    return np.unpackbits(np.frombuffer(data, dtype=np.uint8))
+
+def bits_to_message(bits):
+    data = np.packbits(np.asarray(bits, dtype=np.uint8)).tobytes()
+    end = data.find(bytes([TERMINATOR]))
+    return (data if end == -1 else data[:end]).decode('latin-1')
+
+def pack_kbit(bits, k):
+    # Groups bits MSB-first into k-bit sample values, zero-padding the tail
+    pad = -len(bits) % k
+    if pad:
+        bits = np.concatenate([bits, np.zeros(pad, dtype=np.uint8)])
+    groups = bits.reshape(-1, k)
+    values = groups[:, 0].copy()
+    for j in range(1, k):
+        values <<= 1
+        values |= groups[:, j]
+    return values
+
+def unpack_kbit(values, k):
+    shifts = np.arange(k - 1, -1, -1, dtype=np.uint8)
+    return ((values[:, None] >> shifts) & 1).reshape(-1)
+
+# ---------- k-LSB HEADER ----------
+def make_header(k, length):
+    if not 1 <= k <= MAX_BITS_PER_SAMPLE:
+        raise ValueError(f"Bits per sample must be 1..{MAX_BITS_PER_SAMPLE}")
+    return MAGIC + bytes([k]) + length.to_bytes(4, 'big')
+
+def parse_header(data):
+    if data[:len(MAGIC)] != MAGIC or not 1 <= data[len(MAGIC)] <= MAX_BITS_PER_SAMPLE:
+        return None
+    return data[len(MAGIC)], int.from_bytes(data[len(MAGIC) + 1:HEADER_BYTES], 'big')
+
+def kbit_payload(message, k):
+    # Sample values plus the per-sample mask they are written under
+    data = message.encode('latin-1')
+    header = np.unpackbits(np.frombuffer(make_header(k, len(data)), dtype=np.uint8))
+    body = pack_kbit(np.unpackbits(np.frombuffer(data, dtype=np.uint8)), k)
+    values = np.concatenate([header, body])
+    mask = np.concatenate([np.ones(len(header), dtype=np.uint8),
+                           np.full(len(body), (1 << k) - 1, dtype=np.uint8)])
+    return values, mask
+
+def payload_bits(message, bits_per_channel=None):
+    # Plain null-terminated LSB bits, or a k-LSB header payload when k is given
+    if bits_per_channel is None:
+        return message_to_bits(message), 1
+    return kbit_payload(message, bits_per_channel)
+
+# ---------- PLANE ACCESS ----------
+def lsb_plane(pixels, channel=None):
+    # Flat raster-order view of the carrier samples: every channel
+    # interleaved (R, G, B, R, G, B, ...) or a single channel.
+    if not pixels.flags.c_contiguous:
+        raise ValueError("Pixel array must be C-contiguous")
+    if channel is None:
+        return pixels.reshape(-1)
+    return pixels.reshape(-1, pixels.shape[-1])[:, channel]
+
+def embed_bits(plane, bits, start=0, mask=1):
+    # mask selects the low bits replaced per sample: 1 for plain LSB, or a
+    # per-sample array when header and k-bit payload are written together
+    end = start + len(bits)
+    if end > plane.size:
+        raise ValueError("Message too long for the image")
+    target = plane[start:end]
+    target &= 0xFF ^ mask
+    target |= bits
+    return end
+
+def extract_bits(plane, count, start=0):
+    return plane[start:start + count] & 1
+
+# ---------- IMAGE HELPERS ----------
+def encode_pixels(pixels, message, channel=None):
+    plane = lsb_plane(pixels, channel)
+    embed_bits(plane, message_to_bits(message))
+    return pixels
+
+def decode_pixels(pixels, channel=None):
+    plane = lsb_plane(pixels, channel)
+    usable = plane.size - plane.size % 8
+    return bits_to_message(extract_bits(plane, usable))
+
+# ---------- INCREMENTAL DECODING ----------
+LOW_BITS = (1 << MAX_BITS_PER_SAMPLE) - 1
+
+class LSBStreamReader:
+    # Pulls LSBs from an iterator of pixel strips only as far as the payload
+    # needs, so decoding cost follows the message length, not the image size.
+    def __init__(self, strips, channel=None):
+        self._strips = iter(strips)
+        self.channel = channel
+        self._bits = np.empty(0, dtype=np.uint8)
+
+    def _fill(self, count):
+        chunks = [self._bits]
+        have = len(self._bits)
+        while have < count:
+            strip = next(self._strips, None)
+            if strip is None:
+                break
+            bits = lsb_plane(np.ascontiguousarray(strip), self.channel) & LOW_BITS
+            chunks.append(bits)
+            have += len(bits)
+        self._bits = np.concatenate(chunks)
+
+    def peek_bits(self, count):
+        self._fill(count)
+        return self._bits[:count] & 1
+
+    def read_values(self, count, k=1):
+        self._fill(count)
+        values, self._bits = self._bits[:count], self._bits[count:]
+        return values & ((1 << k) - 1)
+
+    def read_bits(self, count):
+        return self.read_values(count)
+
+    def read_payload(self):
+        # Header images are read for exactly their stated length; anything
+        # else is treated as a null-terminated message.
+        header = parse_header(np.packbits(self.peek_bits(HEADER_BITS)).tobytes())
+        if header is None:
+            return self.read_message()
+        k, length = header
+        self.read_bits(HEADER_BITS)
+        samples = -(-length * 8 // k)
+        bits = unpack_kbit(self.read_values(samples, k), k)[:length * 8]
+        return np.packbits(bits).tobytes().decode('latin-1')
+
+    def read_message(self):
+        data = bytearray()
+        while True:
+            self._fill(8)
+            usable = len(self._bits) - len(self._bits) % 8
+            if usable == 0:
+                break
+            chunk = np.packbits(self.read_bits(usable)).tobytes()
+            end = chunk.find(bytes([TERMINATOR]))
+            if end != -1:
+                data += chunk[:end]
+                break
+            data += chunk
+        return data.decode('latin-1')
@@ -0,0 +1,69 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+# Bounded process-pool runner shared by the batch scripts (LSB batch
+# embedding, HIDDEN OCR and overlays) and the tiled S-UNIWARD cost map.
+# Calls are pulled from a generator only while fewer than queue_size are in
+# flight, so huge job lists never pile up pending work (or pickled
+# arguments) inside the pool.
+
+# ---------- JOB SOURCES ----------
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp', '.tif', '.tiff')
+# Formats that keep every pixel, and the alpha band, exactly
+LOSSLESS_EXTENSIONS = ('.png', '.bmp', '.tif', '.tiff')
+
+def image_files(folder, extensions=IMAGE_EXTENSIONS):
+    return [os.path.join(folder, name) for name in sorted(os.listdir(folder))
+            if name.lower().endswith(extensions)]
+
+# ---------- POOL ----------
+def bounded_submit(pool, calls, queue_size):
+    # calls yields (tag, func, args); yields (tag, result) in completion order
+    pending = {}
+    for tag, func, args in calls:
+        if len(pending) >= queue_size:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for f in done:
+                yield pending.pop(f), f.result()
+        pending[pool.submit(func, *args)] = tag
+    for f in wait(pending).done:
+        yield pending[f], f.result()
+
+# ---------- TIMED JOBS ----------
+def timed_job(func, args, record):
+    # Runs func(*args) in a worker and returns record with the time taken
+    # and the error, if any; fields in a dict returned by func are added.
+    start = time.perf_counter()
+    record = dict(record)
+    try:
+        value = func(*args)
+        if isinstance(value, dict):
+            record.update(value)
+        error = None
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    record.update(seconds=time.perf_counter() - start, error=error)
+    return record
+
+def run_jobs(jobs, workers=None, queue_size=None, report=None, done="jobs done", unit="jobs",
+             initializer=None, initargs=()):
+    # jobs yields (func, args, record); every job runs through timed_job and
+    # report(result) is called as each one completes. Prints a summary line
+    # and returns the results in completion order.
+    workers = workers or os.cpu_count() or 1
+    queue_size = queue_size or 2 * workers
+    results = []
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, initializer=initializer, initargs=initargs) as pool:
+        calls = ((None, timed_job, job) for job in jobs)
+        for _, result in bounded_submit(pool, calls, queue_size):
+            if report:
+                report(result)
+            results.append(result)
+    elapsed = time.perf_counter() - start
+
+    failed = sum(1 for r in results if r["error"])
+    print(f"[✓] {len(results) - failed}/{len(results)} {done} in {elapsed:.2f}s "
+          f"({len(results) / elapsed if elapsed else 0:.1f} {unit}/s, {workers} workers)")
+    return results
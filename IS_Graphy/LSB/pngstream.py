@@ -0,0 +1,191 @@
+import io
+import struct
+import zlib
+import numpy as np
+from PIL import Image
+
+# Row-incremental PNG reading and writing. Only the compressed stream is
+# walked; rows are inflated and un-filtered a strip at a time, so nothing past
+# the last strip requested is ever decoded and memory stays at one strip.
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+COLOR_MODES = {0: ('L', 1), 2: ('RGB', 3), 4: ('LA', 2), 6: ('RGBA', 4)}
+READ_SIZE = 1 << 16
+
+def _png_chunk(ctype, data):
+    crc = zlib.crc32(ctype + data) & 0xFFFFFFFF
+    return struct.pack('>I', len(data)) + ctype + data + struct.pack('>I', crc)
+
+def _read_chunk(f):
+    head = f.read(8)
+    if len(head) < 8:
+        return None, b''
+    length, ctype = struct.unpack('>I4s', head)
+    data = f.read(length)
+    f.read(4)  # CRC
+    return ctype, data
+
+class PNGStripReader:
+    def __init__(self, path):
+        self.file = open(path, 'rb')
+        if self.file.read(8) != PNG_SIGNATURE:
+            self.close()
+            raise ValueError(f"{path} is not a PNG file")
+        ctype, ihdr = _read_chunk(self.file)
+        width, height, depth, color, _, _, interlace = struct.unpack('>IIBBBBB', ihdr)
+        if depth != 8 or interlace or color not in COLOR_MODES:
+            self.close()
+            raise ValueError("Only 8-bit, non-interlaced L/LA/RGB/RGBA PNGs can be streamed")
+        self.width, self.height = width, height
+        self.mode, self.channels = COLOR_MODES[color]
+        self.color = color
+        self.stride = width * self.channels + 1  # filter byte + samples
+        self._inflate = zlib.decompressobj()
+        self._pending = b''
+        self._idat_done = False
+        self._prev = bytes(self.stride - 1)
+        self.row = 0
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _next_idat(self):
+        while not self._idat_done:
+            ctype, data = _read_chunk(self.file)
+            if ctype is None or ctype == b'IEND':
+                self._idat_done = True
+            elif ctype == b'IDAT':
+                return data
+        return None
+
+    def _filtered_rows(self, count):
+        need = count * self.stride
+        while len(self._pending) < need:
+            # Leftover compressed input has to be drained before the next IDAT
+            data = self._inflate.unconsumed_tail or self._next_idat()
+            if data is None:
+                break
+            self._pending += self._inflate.decompress(data, READ_SIZE)
+        raw, self._pending = self._pending[:need], self._pending[need:]
+        return raw
+
+    def read_strip(self, rows):
+        # Un-filtering needs the previous reconstructed row, so the strip is
+        # handed to PIL's C decoder as a tiny PNG whose first row is that
+        # previous row stored with filter type 0.
+        rows = min(rows, self.height - self.row)
+        if rows <= 0:
+            return None
+        raw = self._filtered_rows(rows)
+        ihdr = struct.pack('>IIBBBBB', self.width, rows + 1, 8, self.color, 0, 0, 0)
+        stream = zlib.compress(b'\x00' + self._prev + raw, 0)
+        png = PNG_SIGNATURE + _png_chunk(b'IHDR', ihdr) + _png_chunk(b'IDAT', stream) + _png_chunk(b'IEND', b'')
+        strip = np.array(Image.open(io.BytesIO(png)))[1:]
+        if strip.ndim == 2:
+            strip = strip[..., None]
+        self._prev = strip[-1].tobytes()
+        self.row += rows
+        return strip
+
+    def strips(self, rows=64, growth=1):
+        # growth > 1 starts with one row and widens the strips geometrically,
+        # which keeps early-exit readers from decoding rows they never use.
+        size = 1 if growth > 1 else rows
+        while True:
+            strip = self.read_strip(size)
+            if strip is None:
+                return
+            yield strip
+            size = min(rows, size * growth)
+
+    def read_raw(self, rows):
+        # Filtered scanlines exactly as stored, without reconstructing them
+        rows = min(rows, self.height - self.row)
+        self.row += rows
+        return self._filtered_rows(rows)
+
+class PNGStripWriter:
+    def __init__(self, path, width, height, mode='RGB', level=6):
+        color = {m: c for c, (m, _) in COLOR_MODES.items()}[mode]
+        self.channels = COLOR_MODES[color][1]
+        self.file = open(path, 'wb')
+        self.file.write(PNG_SIGNATURE)
+        ihdr = struct.pack('>IIBBBBB', width, height, 8, color, 0, 0, 0)
+        self.file.write(_png_chunk(b'IHDR', ihdr))
+        self._deflate = zlib.compressobj(level)
+        self._prev = np.zeros((1, width * self.channels), dtype=np.int16)
+
+    def _write_idat(self, data):
+        if data:
+            self.file.write(_png_chunk(b'IDAT', data))
+
+    def write_strip(self, strip):
+        # Paeth filter for every row; on the encoding side all predictors
+        # are known up front, so the whole strip is filtered at once.
+        rows = strip.reshape(strip.shape[0], -1).astype(np.int16)
+        up = np.concatenate([self._prev, rows[:-1]])
+        left = np.zeros_like(rows)
+        left[:, self.channels:] = rows[:, :-self.channels]
+        upleft = np.zeros_like(rows)
+        upleft[:, self.channels:] = up[:, :-self.channels]
+        p = left + up - upleft
+        pa, pb, pc = np.abs(p - left), np.abs(p - up), np.abs(p - upleft)
+        pred = np.where((pa <= pb) & (pa <= pc), left, np.where(pb <= pc, up, upleft))
+        filtered = np.empty((rows.shape[0], rows.shape[1] + 1), dtype=np.uint8)
+        filtered[:, 0] = 4
+        filtered[:, 1:] = (rows - pred) & 0xFF
+        self._prev = rows[-1:]
+        self._write_idat(self._deflate.compress(filtered.tobytes()))
+
+    def write_raw(self, raw):
+        # Pass-through of filtered scanlines; only valid when they reference
+        # rows that were written unchanged.
+        self._write_idat(self._deflate.compress(raw))
+
+    def close(self):
+        self._write_idat(self._deflate.flush())
+        self.file.write(_png_chunk(b'IEND', b''))
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def open_strips(path, rows=64, mode='RGB', growth=1):
+    # Returns ((width, height), strip iterator). Falls back to a full PIL
+    # decode for formats the streaming reader cannot handle (JPEG, palette
+    # or 16-bit PNG, ...).
+    try:
+        reader = PNGStripReader(path)
+    except ValueError:
+        reader = None
+    if reader is not None and reader.mode == mode:
+        return (reader.width, reader.height), _reader_strips(reader, rows, growth)
+    if reader is not None:
+        reader.close()
+    img = Image.open(path)
+    return img.size, _pil_strips(img, rows, mode)
+
+def _reader_strips(reader, rows, growth):
+    with reader:
+        yield from reader.strips(rows, growth)
+
+def _pil_strips(img, rows, mode):
+    if img.mode != mode:
+        img = img.convert(mode)
+    pixels = np.array(img)
+    if pixels.ndim == 2:
+        pixels = pixels[..., None]
+    for y in range(0, pixels.shape[0], rows):
+        yield pixels[y:y + rows]
+
+def iter_strips(path, rows=64, mode='RGB', growth=1):
+    return open_strips(path, rows, mode, growth)[1]
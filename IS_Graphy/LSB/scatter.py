@@ -0,0 +1,91 @@
+import hashlib
+import numpy as np
+from PIL import Image
+from bitplane import LSBStreamReader, lsb_plane
+from pngstream import iter_strips
+
+# Keyed pseudo-random sample order for the LSB scripts. A small Feistel
+# network permutes indices in [0, n) on the fly (cycle-walking values that
+# land outside the range), so positions are produced chunk by chunk and no
+# n-element permutation array is ever allocated.
+
+ROUNDS = 4
+CHUNK = 1 << 20
+FIRST_CHUNK = 1 << 10
+
+class KeyedPermutation:
+    def __init__(self, n, key):
+        if isinstance(key, str):
+            key = key.encode('utf-8')
+        self.n = n
+        bits = max(2, (n - 1).bit_length())
+        self.half = (bits + 1) // 2
+        self.mask = np.uint64((1 << self.half) - 1)
+        # Domain size is mixed in so one key gives unrelated orders on
+        # covers of different sizes.
+        digest = hashlib.sha256(key + n.to_bytes(8, 'big')).digest()
+        self.round_keys = np.frombuffer(digest, dtype='>u8').astype(np.uint64)[:ROUNDS]
+
+    def _round(self, x, k):
+        x = x ^ k
+        x *= np.uint64(0x9E3779B97F4A7C15)
+        x ^= x >> np.uint64(29)
+        x *= np.uint64(0xBF58476D1CE4E5B9)
+        x ^= x >> np.uint64(32)
+        return x & self.mask
+
+    def _feistel(self, x):
+        half = np.uint64(self.half)
+        left, right = x >> half, x & self.mask
+        for k in self.round_keys:
+            left, right = right, left ^ self._round(right, k)
+        return (left << half) | right
+
+    def __call__(self, indices):
+        y = self._feistel(np.asarray(indices, dtype=np.uint64))
+        outside = y >= self.n
+        while outside.any():
+            y[outside] = self._feistel(y[outside])
+            outside = y >= self.n
+        return y.astype(np.intp)
+
+    def chunks(self, count=None, chunk=CHUNK, growth=1):
+        # Positions for slots [0, count) in chunks; growth > 1 starts small
+        # so early-exit decoders only permute what they read.
+        count = self.n if count is None else count
+        size = FIRST_CHUNK if growth > 1 else chunk
+        start = 0
+        while start < count:
+            stop = min(count, start + size)
+            yield start, self(np.arange(start, stop, dtype=np.uint64))
+            start = stop
+            size = min(chunk, size * growth)
+
+def embed_scattered(plane, bits, key, mask=1):
+    if len(bits) > plane.size:
+        raise ValueError("Message too long for the image")
+    perm = KeyedPermutation(plane.size, key)
+    for start, positions in perm.chunks(len(bits)):
+        stop = start + len(positions)
+        chunk_mask = mask if np.isscalar(mask) else mask[start:stop]
+        plane[positions] = (plane[positions] & (0xFF ^ chunk_mask)) | bits[start:stop]
+    return len(bits)
+
+def scattered_samples(plane, key):
+    # Samples in keyed order, for LSBStreamReader
+    perm = KeyedPermutation(plane.size, key)
+    for _, positions in perm.chunks(growth=4):
+        yield plane[positions]
+
+def check_streamable(stream, key):
+    if stream and key is not None:
+        raise ValueError("Keyed scattering touches the whole image and cannot be streamed")
+
+def open_reader(path, key=None, channel=None):
+    # LSBStreamReader for a stego image. Without a key rows are pulled a
+    # strip at a time, so decoding stops once the payload has been read;
+    # keyed images are spread over every row, so the whole image is loaded.
+    if key is None:
+        return LSBStreamReader(iter_strips(path, growth=2), channel=channel)
+    pixels = np.array(Image.open(path).convert('RGB'))
+    return LSBStreamReader(scattered_samples(lsb_plane(pixels, channel), key))
@@ -0,0 +1,64 @@
+import numpy as np
+from bitplane import lsb_plane, embed_bits
+from pngstream import PNGStripReader, PNGStripWriter, open_strips
+
+# Bounded-memory embedding for very large covers. The cover is read and the
+# stego PNG written a strip at a time; for PNG covers the rows after the
+# payload are copied as stored scanlines and never reconstructed.
+
+def _open_reader(path):
+    try:
+        reader = PNGStripReader(path)
+    except ValueError:
+        return None
+    if reader.mode != 'RGB':
+        reader.close()
+        return None
+    return reader
+
+def _reader_strips(reader, rows):
+    while True:
+        strip = reader.read_strip(rows)
+        if strip is None:
+            return
+        yield strip
+
+def embed_stream(input_path, output_path, bits, channel=None, strip_rows=64, mask=1):
+    reader = _open_reader(input_path)
+    if reader is None:
+        (width, height), strips = open_strips(input_path, strip_rows)
+    else:
+        width, height = reader.width, reader.height
+        strips = _reader_strips(reader, strip_rows)
+
+    samples = width * height * (3 if channel is None else 1)
+    if len(bits) > samples:
+        if reader is not None:
+            reader.close()
+        raise ValueError("Message too long for the image")
+
+    offset = changed = 0
+    with PNGStripWriter(output_path, width, height) as writer:
+        for strip in strips:
+            if offset < len(bits):
+                before = strip.copy()
+                plane = lsb_plane(strip, channel)
+                take = min(plane.size, len(bits) - offset)
+                embed_bits(plane, bits[offset:offset + take],
+                           mask=mask if np.isscalar(mask) else mask[offset:offset + take])
+                offset += take
+                changed += np.count_nonzero((strip != before).any(axis=-1))
+            writer.write_strip(strip)
+            if offset >= len(bits) and reader is not None:
+                break
+        if reader is not None:
+            with reader:
+                # The first untouched row still has to be re-filtered against
+                # the modified row above it; everything below is copied as is.
+                boundary = reader.read_strip(1)
+                if boundary is not None:
+                    writer.write_strip(boundary)
+                while reader.row < reader.height:
+                    writer.write_raw(reader.read_raw(strip_rows))
+    # Number of pixels whose value actually changed
+    return changed
@@ -0,0 +1,99 @@
+import os
+import struct
+import tempfile
+import numpy as np
+from PIL import Image
+from bitplane import payload_bits, lsb_plane
+from scatter import KeyedPermutation
+from streaming import embed_stream
+
+# Rewrites the payload of an existing stego image in place, flipping only the
+# LSBs that differ from the new message. Uncompressed BMPs are patched
+# directly in the file through a memory map, so only payload pixels are read
+# or written. PNGs are streamed, and only the strips that carry payload are
+# decoded. Keyed PNGs spread over the whole image and are reloaded in full.
+
+def _samples_per_pixel(channel):
+    return 3 if channel is None else 1
+
+def _positions(count, n_samples, key):
+    if key is None:
+        return np.arange(count, dtype=np.intp)
+    return KeyedPermutation(n_samples, key)(np.arange(count, dtype=np.uint64))
+
+def _flip(current, values, mask):
+    updated = (current & (0xFF ^ mask)) | values
+    return updated, updated != current
+
+def _bmp_layout(path):
+    with open(path, 'rb') as f:
+        head = f.read(54)
+    if len(head) < 54 or head[:2] != b'BM':
+        return None
+    data_offset, = struct.unpack_from('<I', head, 10)
+    width, height, _, bpp, compression = struct.unpack_from('<iiHHI', head, 18)
+    if bpp not in (24, 32) or compression != 0:
+        return None
+    return data_offset, width, height, bpp // 8
+
+def _update_bmp(path, layout, values, mask, channel, key):
+    data_offset, width, height, pixel_bytes = layout
+    spp = _samples_per_pixel(channel)
+    n_samples = width * abs(height) * spp
+    if len(values) > n_samples:
+        raise ValueError("Message too long for the image")
+    samples = _positions(len(values), n_samples, key)
+    pixel, component = np.divmod(samples, spp)
+    if channel is not None:
+        component = np.full_like(pixel, channel)
+    y, x = np.divmod(pixel, width)
+    row = abs(height) - 1 - y if height > 0 else y  # positive height = bottom-up
+    stride = (width * pixel_bytes + 3) & ~3
+    # Stored as BGR(A): red is the third byte of a pixel
+    offsets = data_offset + row * stride + x * pixel_bytes + (2 - component)
+
+    mapped = np.memmap(path, dtype=np.uint8, mode='r+')
+    updated, changed = _flip(mapped[offsets], values, mask)
+    mapped[offsets[changed]] = updated[changed]
+    mapped.flush()
+    del mapped
+    return len(np.unique(pixel[changed]))
+
+def _update_in_memory(path, output_path, values, mask, channel, key):
+    img = Image.open(path)
+    pixels = np.array(img.convert('RGB'))
+    plane = lsb_plane(pixels, channel)
+    if len(values) > plane.size:
+        raise ValueError("Message too long for the image")
+    samples = _positions(len(values), plane.size, key)
+    updated, changed = _flip(plane[samples], values, mask)
+    plane[samples[changed]] = updated[changed]
+    Image.fromarray(pixels).save(output_path, format=img.format)
+    return len(np.unique(samples[changed] // _samples_per_pixel(channel)))
+
+def update_stego(stego_path, message, output_path=None, channel=None, bits_per_channel=None, key=None):
+    # Same payload layout as encode_udh / encode_image (channel=None) or
+    # encode_red_channel (channel=0); returns the number of pixels changed.
+    values, mask = payload_bits(message, bits_per_channel)
+    if output_path is not None and output_path != stego_path:
+        with open(stego_path, 'rb') as src, open(output_path, 'wb') as dst:
+            dst.write(src.read())
+        stego_path = output_path
+
+    layout = _bmp_layout(stego_path)
+    if layout is not None:
+        changed = _update_bmp(stego_path, layout, values, mask, channel, key)
+    elif key is None and Image.open(stego_path).format == 'PNG':
+        fd, temp_path = tempfile.mkstemp(suffix='.png', dir=os.path.dirname(os.path.abspath(stego_path)))
+        os.close(fd)
+        try:
+            changed = embed_stream(stego_path, temp_path, values, channel, mask=mask)
+            os.replace(temp_path, stego_path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+    else:
+        changed = _update_in_memory(stego_path, stego_path, values, mask, channel, key)
+
+    print(f"[✓] Payload updated in {stego_path}: {changed} pixels changed")
+    return changed
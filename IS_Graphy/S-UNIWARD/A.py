@@ -4,77 +4,167 @@ import numpy as np
 import pywt
 import imageio.v3 as iio
 from skimage import img_as_float
-from skimage.transform import resize
+from concurrent.futures import ProcessPoolExecutor
+import os
+from functools import partial
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "WOW"))
+from cost_lsb import cost_map, keyed_cost_map, embed_message_uint8, extract_message_uint8, extract_message_keyed
+from stc import extract_message_stc
+from hill import compute_rho_HILL
+from jobs import JobRunner, scaled
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "LSB"))
+from jobpool import bounded_submit
 
 # ---------- CORE FUNCTIONS ----------
-def calculate_costs(image):
-    coeffs = pywt.dwtn(image, 'db8')
-    cost = np.zeros_like(image)
-    for key, value in coeffs.items():
-        if key != 'aa':
-            resized = resize(np.abs(value), image.shape, anti_aliasing=True)
-            cost += resized
-    cost = cost / np.max(cost)
-    cost = 1 / (cost + 1e-6)
+# The cost is the baseline one: a 'symmetric' db8 dwtn of the whole image,
+# every detail band bilinearly resized to the image shape (skimage resize),
+# summed and inverted. It is computed tile by tile: each output tile pulls
+# exactly the band coefficients its interpolation reads, and those from the
+# image rows/columns they depend on, so memory stays bounded by the tile size
+# and the stitched map equals the whole-image computation. The DWT and the
+# blend run in float64: float32 band sums carry noise near 1e-7, as large as
+# the 1e-6 stabiliser, which moved the cost of the smoothest pixels by up to 9%.
+TILE = 512
+WAVELET = 'db8'
+
+def _axis_plan(size, band, start, stop, taps):
+    # For output pixels [start, stop) along one axis: the image span whose
+    # DWT gives the coefficients needed, the count of those coefficients, and
+    # for each pixel the two coefficients it blends and the weight of the
+    # second. resize/zoom (grid_mode) reads band coordinate
+    # (i + 0.5) * band / size - 0.5, mirroring the band at its edges.
+    coord = (np.arange(start, stop) + 0.5) * (band / size) - 0.5
+    lower = np.floor(coord).astype(np.int64)
+    pair = np.abs(np.stack([lower, lower + 1]))
+    pair = np.where(pair < band, pair, 2 * band - 2 - pair)
+    k0, k1 = int(pair.min()), int(pair.max()) + 1
+    # Coefficient k depends on extended samples 2k - (taps - 2) .. 2k + 1
+    span = (2 * k0 - (taps - 2), 2 * k1)
+    return span, k1 - k0, pair - k0, coord - lower
+
+def _symmetric_span(start, stop, size):
+    # Slice for an in-bounds span, else indices reflected (half-sample) into the image
+    if start >= 0 and stop <= size:
+        return slice(start, stop)
+    index = np.arange(start, stop) % (2 * size)
+    return np.where(index < size, index, 2 * size - 1 - index)
+
+def _image_block(image, rows, cols):
+    # image[rows, cols] with the DWT's symmetric extension past the borders
+    block = image[_symmetric_span(*rows, image.shape[0])]
+    return np.asarray(block[:, _symmetric_span(*cols, image.shape[1])], dtype=np.float64)
+
+def _tile_costs(block, row_plan, col_plan, taps):
+    n_rows, (row0, row1), row_t = row_plan
+    n_cols, (col0, col1), col_t = col_plan
+    offset = (taps - 2) // 2  # coefficient k of the span is coefficient k + offset of the block
+    cost = np.zeros((len(row_t), len(col_t)))
+    for key, value in pywt.dwtn(block, WAVELET).items():
+        if key == 'aa':
+            continue
+        band = np.abs(value[offset:offset + n_rows, offset:offset + n_cols])
+        band = band[row0] * (1 - row_t)[:, None] + band[row1] * row_t[:, None]
+        cost += band[:, col0] * (1 - col_t) + band[:, col1] * col_t
     return cost
 
-def embed_message_uint8(image_uint8, message, costs):
-    flat_img = image_uint8.flatten()
-    flat_costs = costs.flatten()
+def calculate_costs(image, tile=TILE, workers=1, out=None, progress=None):
+    # workers=1 computes the tiles in this process; a process pool only pays
+    # off on several cores, and the GUI never asks for one. progress(fraction)
+    # is called as tiles complete.
+    h, w = image.shape
+    taps = pywt.Wavelet(WAVELET).dec_len
+    band_h, band_w = (pywt.dwt_coeff_len(n, taps, 'symmetric') for n in (h, w))
+    tile = max(h, w) if tile is None else tile
+    cost = np.empty((h, w), dtype=np.float32) if out is None else out
 
-    message_length = len(message)
-    length_bits = f'{message_length:016b}'
-    message_bits = length_bits + ''.join(f'{ord(c):08b}' for c in message)
+    def job(y0, x0):
+        y1, x1 = min(y0 + tile, h), min(x0 + tile, w)
+        rows, *row_plan = _axis_plan(h, band_h, y0, y1, taps)
+        cols, *col_plan = _axis_plan(w, band_w, x0, x1, taps)
+        return (y0, y1, x0, x1), (_image_block(image, rows, cols), row_plan, col_plan, taps)
 
-    sorted_indices = np.argsort(flat_costs)
+    origins = [(y0, x0) for y0 in range(0, h, tile) for x0 in range(0, w, tile)]
+    done = 0
 
-    for i, bit in enumerate(message_bits):
-        idx = sorted_indices[i]
-        pixel = flat_img[idx]
-        if (pixel & 1) != int(bit):
-            flat_img[idx] ^= 1
+    def place(box, result):
+        nonlocal done
+        y0, y1, x0, x1 = box
+        cost[y0:y1, x0:x1] = result
+        done += 1
+        if progress:
+            progress(done / len(origins))
 
-    return flat_img.reshape(image_uint8.shape), sorted_indices
+    if workers == 1 or len(origins) == 1:
+        for origin in origins:
+            box, args = job(*origin)
+            place(box, _tile_costs(*args))
+    else:
+        workers = workers or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # Bounded submission: blocks are cut lazily, so only a few are alive at once
+            calls = ((box, _tile_costs, args) for box, args in (job(*origin) for origin in origins))
+            for box, result in bounded_submit(pool, calls, 2 * workers):
+                place(box, result)
 
-def extract_message_uint8(image_uint8, sorted_indices):
-    flat_img = image_uint8.flatten()
+    # Global normalization once all tiles are in, done in place
+    cost /= np.max(cost)
+    cost += 1e-6
+    np.reciprocal(cost, out=cost)
+    return cost
 
-    # Read 16-bit length prefix
-    bits = ''
-    for i in range(16):
-        idx = sorted_indices[i]
-        bits += str(flat_img[idx] & 1)
-    message_length = int(bits, 2)
+# Cost maps offered by the GUI: cache name, function and parameters
+COST_FUNCTIONS = {
+    # Distinct cache name from the earlier periodization and float32 maps, which differ
+    'S-UNIWARD': ('suniward-symmetric64', calculate_costs, {}),
+    'HILL': ('hill', compute_rho_HILL, {'l1': 3, 'l2': 15}),
+}
 
-    bits = ''
-    for i in range(16, 16 + message_length * 8):
-        idx = sorted_indices[i]
-        bits += str(flat_img[idx] & 1)
+def image_costs(image, method='S-UNIWARD', progress=None):
+    return cost_map(image, COST_FUNCTIONS[method], progress)
 
-    chars = [chr(int(bits[i:i+8], 2)) for i in range(0, len(bits), 8)]
-    return ''.join(chars)
+def keyed_costs(image_uint8, method='S-UNIWARD', progress=None):
+    return keyed_cost_map(image_uint8, COST_FUNCTIONS[method], progress)
 
 # ---------- GUI ----------
 class StegoGUI:
     def __init__(self, master):
         self.master = master
         master.title("S-UNIWARD Steganography (RGB + Auto-Length + External Stego)")
-        master.geometry("650x480")
-        self.image = None
-        self.gray_image = None
-        self.costs = None
-        self.gray_uint8 = None
+        master.geometry("650x680")
+        self.covers = {}  # file name -> loaded cover, one entry per cover
 
         # UI Components
         tk.Label(master, text="S-UNIWARD Steganography GUI", font=("Arial", 16)).pack(pady=10)
 
-        self.load_button = tk.Button(master, text="Load Cover Image (RGB or Gray)", command=self.load_image)
+        self.load_button = tk.Button(master, text="Load Cover Image(s) (RGB or Gray)", command=self.load_image)
         self.load_button.pack(pady=5)
 
+        self.cover_var = tk.StringVar(value="")
+        cover_row = tk.Frame(master)
+        cover_row.pack()
+        tk.Label(cover_row, text="Embed into:").pack(side=tk.LEFT)
+        self.cover_menu = tk.OptionMenu(cover_row, self.cover_var, "")
+        self.cover_menu.pack(side=tk.LEFT)
+
         self.message_entry = tk.Entry(master, width=50)
         self.message_entry.pack(pady=5)
         self.message_entry.insert(0, "Enter your secret message here")
 
+        tk.Label(master, text="Key (leave empty to use an order file):").pack()
+        self.key_entry = tk.Entry(master, width=50, show="*")
+        self.key_entry.pack(pady=5)
+
+        self.cost_var = tk.StringVar(value='S-UNIWARD')
+        cost_row = tk.Frame(master)
+        cost_row.pack()
+        tk.Label(cost_row, text="Cost function:").pack(side=tk.LEFT)
+        tk.OptionMenu(cost_row, self.cost_var, *COST_FUNCTIONS).pack(side=tk.LEFT)
+
+        self.stc_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(master, text="Syndrome-trellis coding (no order file)", variable=self.stc_var).pack()
+
         self.embed_button = tk.Button(master, text="Embed and Save Stego Image", command=self.embed)
         self.embed_button.pack(pady=5)
 
@@ -86,52 +176,103 @@ class StegoGUI:
         self.output_label = tk.Label(master, text="", font=("Arial", 12))
         self.output_label.pack(pady=10)
 
+        self.jobs = JobRunner(master)
+
     def load_image(self):
-        file_path = filedialog.askopenfilename(title="Select Cover Image")
-        if file_path:
-            image = iio.imread(file_path)
-            if image.ndim == 3 and image.shape[2] == 3:
-                gray = np.dot(image[..., :3], [0.299, 0.587, 0.114])
-            else:
-                gray = image if image.ndim == 2 else image[:, :, 0]
-            gray_float = img_as_float(gray)
-            self.gray_image = gray_float
-            self.gray_uint8 = (gray_float * 255).astype(np.uint8)
-            self.costs = calculate_costs(gray_float)
-            messagebox.showinfo("Success", "Cover image loaded and cost map calculated.")
+        # Several covers can be picked; each is loaded and costed in turn on
+        # the worker and added to the cover menu when it is ready.
+        for file_path in filedialog.askopenfilenames(title="Select Cover Image"):
+            self.jobs.submit(f"Loading {os.path.basename(file_path)}",
+                             partial(self._load_job, file_path, self.cost_var.get()),
+                             on_done=self._cover_loaded,
+                             on_error=lambda e: messagebox.showerror("Error", f"Loading failed: {str(e)}"))
 
-    def embed(self):
-        if self.gray_image is None:
-            messagebox.showerror("Error", "Load a cover image first.")
-            return
+    def _load_job(self, file_path, method, progress):
+        # Runs on the worker and only returns the cover; the Tk thread stores it
+        progress(0.05, "reading")
+        image = iio.imread(file_path)
+        if image.ndim == 3 and image.shape[2] == 3:
+            gray = np.dot(image[..., :3], [0.299, 0.587, 0.114])
+        else:
+            gray = image if image.ndim == 2 else image[:, :, 0]
+        gray_float = img_as_float(gray)
+        costs = image_costs(gray_float, method, progress=scaled(progress, 0.1, 1.0, "computing costs"))
+        progress(1.0, "cost map ready")
+        return {"name": os.path.basename(file_path), "gray": gray_float,
+                "uint8": (gray_float * 255).astype(np.uint8), "costs": {method: costs}}
 
+    def _cover_loaded(self, cover):
+        self.covers[cover["name"]] = cover
+        menu = self.cover_menu["menu"]
+        menu.delete(0, tk.END)
+        for name in self.covers:
+            menu.add_command(label=name, command=tk._setit(self.cover_var, name))
+        self.cover_var.set(cover["name"])
+        self.output_label.config(text=f"Cover loaded: {cover['name']}")
+
+    def embed(self):
         message = self.message_entry.get()
         if not message:
             messagebox.showerror("Error", "Enter a secret message.")
             return
+        cover = self.covers.get(self.cover_var.get())
+        if cover is None:
+            messagebox.showerror("Error", "Load a cover image first.")
+            return
+
+        self.jobs.submit(f"Embedding into {cover['name']}",
+                         partial(self._embed_job, cover, message, self.key_entry.get() or None,
+                                 self.cost_var.get(), self.stc_var.get()),
+                         on_done=lambda text: messagebox.showinfo("Success", text),
+                         on_error=lambda e: messagebox.showerror("Embedding Failed", str(e)))
 
-        try:
-            stego_uint8, sorted_indices = embed_message_uint8(self.gray_uint8.copy(), message, self.costs)
-            output_dir = r"C:\Users\nirno\Codes\yhpargonagets\IS_Graphy\S-UNIWARD"
-            iio.imwrite(f"{output_dir}\\stego_image.png", stego_uint8)
-            np.save(f"{output_dir}\\stego_order.npy", sorted_indices)
-            messagebox.showinfo("Success", "Message embedded and saved as stego_image.png + stego_order.npy.")
-        except Exception as e:
-            messagebox.showerror("Embedding Failed", str(e))
+    def _embed_job(self, cover, message, key, method, use_stc, progress):
+        if key and not use_stc:
+            # Keyed mode: the receiver recomputes the order, no sidecar, and
+            # the payload is encrypted with the key
+            costs = keyed_costs(cover["uint8"], method, progress=scaled(progress, 0.0, 0.5, "computing costs"))
+        else:
+            costs = cover["costs"].get(method)
+            if costs is None:
+                costs = image_costs(cover["gray"], method, progress=scaled(progress, 0.0, 0.5, "computing costs"))
+        stego_uint8, sorted_indices = embed_message_uint8(cover["uint8"].copy(), message, costs, key, stc=use_stc,
+                                                          progress=scaled(progress, 0.5, 0.9, "embedding"))
+        progress(0.9, "writing")
+        output_dir = r"C:\Users\nirno\Codes\yhpargonagets\IS_Graphy\S-UNIWARD"
+        stem = "stego_" + os.path.splitext(cover["name"])[0]
+        iio.imwrite(f"{output_dir}\\{stem}.png", stego_uint8)
+        if use_stc or key:
+            how = "with STC" if use_stc else "with key"
+            return f"Message embedded {how} and saved as {stem}.png."
+        np.save(f"{output_dir}\\{stem}_order.npy", sorted_indices)
+        return f"Message embedded and saved as {stem}.png + {stem}_order.npy."
 
     def load_stego_and_extract(self):
         file_path = filedialog.askopenfilename(title="Select Stego Image")
-        if file_path:
-            try:
-                stego_uint8 = iio.imread(file_path, mode='L')
-                sorted_indices_path = filedialog.askopenfilename(title="Select Matching stego_order.npy")
-                if not sorted_indices_path.endswith(".npy"):
-                    raise ValueError("You must select a valid .npy file.")
-                sorted_indices = np.load(sorted_indices_path)
-                message = extract_message_uint8(stego_uint8, sorted_indices)
-                self.output_label.config(text=f"Recovered Message: {message}")
-            except Exception as e:
-                messagebox.showerror("Error", f"Extraction failed: {str(e)}")
+        if not file_path:
+            return
+        key = self.key_entry.get()
+        sorted_indices_path = None
+        if not self.stc_var.get() and not key:
+            sorted_indices_path = filedialog.askopenfilename(title="Select Matching Order File (.npy)")
+            if not sorted_indices_path.endswith(".npy"):
+                messagebox.showerror("Error", "Extraction failed: You must select a valid .npy file.")
+                return
+        self.jobs.submit(f"Extracting {os.path.basename(file_path)}",
+                         partial(self._extract_job, file_path, key, self.cost_var.get(),
+                                 self.stc_var.get(), sorted_indices_path),
+                         on_done=lambda message: self.output_label.config(text=f"Recovered Message: {message}"),
+                         on_error=lambda e: messagebox.showerror("Error", f"Extraction failed: {str(e)}"))
+
+    def _extract_job(self, file_path, key, method, use_stc, sorted_indices_path, progress):
+        stego_uint8 = iio.imread(file_path, mode='L')
+        progress(0.3, "decoding")
+        if use_stc:
+            return extract_message_stc(stego_uint8, key or None)
+        if key:
+            return extract_message_keyed(stego_uint8, key, COST_FUNCTIONS[method],
+                                         scaled(progress, 0.3, 1.0, "computing costs"))
+        return extract_message_uint8(stego_uint8, np.load(sorted_indices_path))
 
 # ---------- RUN ----------
 if __name__ == "__main__":
@@ -0,0 +1,251 @@
+import argparse
+import os
+import queue
+import threading
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import Future
+from multiprocessing.connection import Client, Listener
+import numpy as np
+import torch
+from PIL import Image
+from steganogan import SteganoGAN
+from steganogan.utils import bits_to_bytearray, bytearray_to_text
+
+# Resident SteganoGAN worker. The model is loaded once, intra-op threads are
+# set explicitly, and requests queued within BATCH_WINDOW of each other are
+# grouped by operation and image size and run as one batch through the
+# encoder / decoder. Local clients talk to it through a
+# multiprocessing.connection socket; in-process callers can use submit().
+#
+# Tensors follow steganogan's own layout (N, C, width, height) and scaling,
+# so results match SteganoGAN.encode / SteganoGAN.decode.
+
+ADDRESS = ('localhost', 6010)
+AUTHKEY = b'steganogan'
+MAX_BATCH = 16
+BATCH_WINDOW = 0.01
+
+def _read_rgb(image):
+    if isinstance(image, str):
+        return np.asarray(Image.open(image).convert('RGB'))
+    return np.asarray(image, dtype=np.uint8)
+
+def _vote(bits):
+    # Same message recovery as SteganoGAN.decode: the payload is repeated,
+    # so the most common candidate between 32-bit zero separators wins.
+    candidates = Counter()
+    for candidate in bits_to_bytearray(bits).split(b'\x00\x00\x00\x00'):
+        candidate = bytearray_to_text(bytearray(candidate))
+        if candidate:
+            candidates[candidate] += 1
+    if len(candidates) == 0:
+        raise ValueError('Failed to find message.')
+    return candidates.most_common(1)[0][0]
+
+class StegoService:
+    def __init__(self, architecture='dense', path=None, threads=None, max_batch=MAX_BATCH, cuda=False, model=None):
+        torch.set_num_threads(threads or os.cpu_count() or 1)
+        self.model = model or SteganoGAN.load(architecture=None if path else architecture, path=path, cuda=cuda)
+        self.model.encoder.eval()
+        self.model.decoder.eval()
+        self.device = self.model.device
+        self.max_batch = max_batch
+        self._requests = queue.Queue()
+        # Started here rather than on the first submit, so concurrent clients
+        # can never race to start a second consumer
+        self._worker = threading.Thread(target=self._serve_queue, daemon=True)
+        self._worker.start()
+
+    # ---------- BATCHED MODEL CALLS ----------
+    def encode_batch(self, covers, texts):
+        # Same-size RGB uint8 covers -> stego uint8 images
+        covers = [_read_rgb(c) for c in covers]
+        with torch.inference_mode():
+            cover = torch.from_numpy(np.stack(covers)).float().div_(127.5).sub_(1.0).permute(0, 3, 2, 1)
+            _, _, width, height = cover.size()
+            payload = torch.cat([self.model._make_payload(height, width, self.model.data_depth, text) for text in texts])
+            generated = self.model.encoder(cover.to(self.device), payload.to(self.device)).clamp(-1.0, 1.0)
+            generated = (generated.permute(0, 3, 2, 1).cpu().numpy() + 1.0) * 127.5
+        return list(generated.astype('uint8'))
+
+    def decode_batch(self, images):
+        # Same-size RGB uint8 stego images -> messages (or the exception)
+        images = [_read_rgb(i) for i in images]
+        with torch.inference_mode():
+            image = torch.from_numpy(np.stack(images)).float().div_(255.0).permute(0, 3, 2, 1)
+            # 0/1 ints, not bools: bits_to_bytearray joins str(bit)
+            bits = (self.model.decoder(image.to(self.device)) > 0).reshape(len(images), -1).int().cpu().numpy()
+        results = []
+        for row in bits:
+            try:
+                results.append(_vote(row.tolist()))
+            except ValueError as e:
+                results.append(e)
+        return results
+
+    # ---------- QUEUE ----------
+    def submit(self, op, image, text=None, output=None):
+        # op is 'encode' or 'decode'; returns a Future with the stego image
+        # (or output path, when given) or the decoded message
+        future = Future()
+        self._requests.put((op, _read_rgb(image), text, output, future))
+        return future
+
+    def _next_batch(self):
+        batch = [self._requests.get()]
+        deadline = time.perf_counter() + BATCH_WINDOW
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._requests.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _serve_queue(self):
+        while True:
+            groups = defaultdict(list)
+            for request in self._next_batch():
+                groups[request[0], request[1].shape].append(request)
+            for (op, _), requests in groups.items():
+                try:
+                    if op == 'encode':
+                        results = self.encode_batch([r[1] for r in requests], [r[2] for r in requests])
+                    elif op == 'decode':
+                        results = self.decode_batch([r[1] for r in requests])
+                    else:
+                        raise ValueError(f"Unknown operation: {op}")
+                except Exception as e:
+                    results = [e] * len(requests)
+                for (_, _, _, output, future), result in zip(requests, results):
+                    if isinstance(result, Exception):
+                        future.set_exception(result)
+                        continue
+                    try:
+                        if output is not None:
+                            Image.fromarray(result).save(output)
+                            result = output
+                        future.set_result(result)
+                    except Exception as e:
+                        future.set_exception(e)
+
+    # ---------- SOCKET API ----------
+    def serve(self, address=ADDRESS, authkey=AUTHKEY):
+        # Requests: {'op': 'encode', 'image': path or array, 'text': ..., 'output': path}
+        #           {'op': 'decode', 'image': path or array}
+        with Listener(address, authkey=authkey) as listener:
+            print(f"[✓] SteganoGAN service listening on {listener.address}")
+            while True:
+                conn = listener.accept()
+                threading.Thread(target=self._handle, args=(conn,), daemon=True).start()
+
+    def _handle(self, conn):
+        with conn:
+            while True:
+                try:
+                    request = conn.recv()
+                except EOFError:
+                    return
+                try:
+                    future = self.submit(request['op'], request['image'], request.get('text'), request.get('output'))
+                    conn.send({'ok': True, 'result': future.result()})
+                except Exception as e:
+                    conn.send({'ok': False, 'error': f"{type(e).__name__}: {e}"})
+
+class StegoClient:
+    def __init__(self, address=ADDRESS, authkey=AUTHKEY):
+        self.conn = Client(address, authkey=authkey)
+
+    def _call(self, **request):
+        self.conn.send(request)
+        reply = self.conn.recv()
+        if not reply['ok']:
+            raise RuntimeError(reply['error'])
+        return reply['result']
+
+    def encode(self, cover, output, text):
+        return self._call(op='encode', image=cover, text=text, output=output)
+
+    def decode(self, image):
+        return self._call(op='decode', image=image)
+
+    def close(self):
+        self.conn.close()
+
+# ---------- SELF CHECK ----------
+# A stand-in model that needs no weights: the encoder writes each payload bit
+# as a bright or dark red channel and the decoder thresholds it, so
+# encode -> decode through the service recovers the text exactly. Covers
+# must hold one full payload: the error correction makes even short texts
+# 6-12 kbit.
+class _StubEncoder(torch.nn.Module):
+    def forward(self, cover, payload):
+        stego = cover.clone()
+        stego[:, 0] = payload[:, 0] * 1.8 - 0.9
+        return stego
+
+class _StubDecoder(torch.nn.Module):
+    def forward(self, image):
+        return image[:, :1] - 0.5
+
+class _StubModel:
+    data_depth = 1
+    device = torch.device('cpu')
+    _make_payload = SteganoGAN._make_payload
+
+    def __init__(self):
+        self.encoder, self.decoder = _StubEncoder(), _StubDecoder()
+
+def self_check(size=(160, 120), texts=('first message', 'second, longer message', 'third')):
+    service = StegoService(threads=1, model=_StubModel())
+    rng = np.random.default_rng(0)
+    covers = list(rng.integers(0, 256, (len(texts), size[1], size[0], 3), dtype=np.uint8))
+    decoded = service.decode_batch(service.encode_batch(covers, list(texts)))
+    if decoded != list(texts):
+        raise RuntimeError(f"Batch round trip failed: {decoded}")
+    # Same through the queue, with mixed operations and image sizes
+    stego = service.submit('encode', covers[0], texts[0]).result()
+    small = service.submit('encode', covers[1][:112, :128], texts[1]).result()
+    queued = [service.submit('decode', stego), service.submit('decode', small)]
+    if [f.result() for f in queued] != [texts[0], texts[1]]:
+        raise RuntimeError("Queued round trip failed")
+    print(f"[✓] encode -> decode round trip ok for {len(texts)} messages")
+
+# ---------- BENCHMARK ----------
+def benchmark(service, size=(256, 256), batch_sizes=(1, 4, 16), rounds=3, text='This is a secret message.'):
+    rng = np.random.default_rng(0)
+    for batch in batch_sizes:
+        covers = list(rng.integers(0, 256, (batch, size[1], size[0], 3), dtype=np.uint8))
+        service.encode_batch(covers[:1], [text])  # warm-up
+        start = time.perf_counter()
+        for _ in range(rounds):
+            stegos = service.encode_batch(covers, [text] * batch)
+        encode_rate = batch * rounds / (time.perf_counter() - start)
+        start = time.perf_counter()
+        for _ in range(rounds):
+            service.decode_batch(stegos)
+        decode_rate = batch * rounds / (time.perf_counter() - start)
+        print(f"[✓] batch {batch:2d}: encode {encode_rate:6.2f} images/s, decode {decode_rate:6.2f} images/s "
+              f"({size[0]}x{size[1]}, {torch.get_num_threads()} threads)")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Resident SteganoGAN encode/decode service")
+    parser.add_argument("command", choices=["serve", "bench", "check"])
+    parser.add_argument("--architecture", default="dense")
+    parser.add_argument("--threads", type=int, help="torch intra-op threads (default: all cores)")
+    parser.add_argument("--max-batch", type=int, default=MAX_BATCH)
+    parser.add_argument("--port", type=int, default=ADDRESS[1])
+    parser.add_argument("--size", type=int, nargs=2, default=(256, 256), metavar=("W", "H"))
+    args = parser.parse_args()
+
+    if args.command == "check":
+        self_check()
+    else:
+        service = StegoService(args.architecture, threads=args.threads, max_batch=args.max_batch)
+        if args.command == "serve":
+            service.serve((ADDRESS[0], args.port))
+        else:
+            benchmark(service, tuple(args.size))
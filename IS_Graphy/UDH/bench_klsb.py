@@ -0,0 +1,45 @@
+import os
+import sys
+import tempfile
+import time
+import numpy as np
+from PIL import Image
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "LSB"))
+from bitplane import kbit_payload, lsb_plane, embed_bits, HEADER_BITS
+from lib import encode_udh
+from lib_decode import decode_udh
+
+# Throughput and capacity of the k-LSB UDH mode for k = 1..4
+
+def benchmark(width=2048, height=2048, repeats=3):
+    megapixels = width * height / 1e6
+    cover = np.random.default_rng(0).integers(0, 256, (height, width, 3), dtype=np.uint8)
+    workdir = tempfile.mkdtemp()
+    cover_path = os.path.join(workdir, "cover.png")
+    stego_path = os.path.join(workdir, "stego.png")
+    Image.fromarray(cover).save(cover_path)
+
+    print(f"Cover: {width}x{height} ({megapixels:.1f} MP)")
+    print(f"{'k':>2} {'capacity KB':>12} {'KB/MP':>8} {'embed MB/s':>11} {'file MB/s':>10}")
+    for k in range(1, 5):
+        capacity = (cover.size - HEADER_BITS) * k // 8
+        message = ''.join(map(chr, np.random.default_rng(k).integers(32, 127, capacity)))
+
+        start = time.perf_counter()
+        for _ in range(repeats):
+            pixels = cover.copy()
+            bits, mask = kbit_payload(message, k)
+            embed_bits(lsb_plane(pixels), bits, mask=mask)
+        in_memory = (time.perf_counter() - start) / repeats
+
+        start = time.perf_counter()
+        encode_udh(cover_path, message, stego_path, bits_per_channel=k)
+        end_to_end = time.perf_counter() - start
+        assert decode_udh(stego_path) == message
+
+        print(f"{k:>2} {capacity / 1024:>12.0f} {capacity / 1024 / megapixels:>8.0f} "
+              f"{capacity / in_memory / 1e6:>11.1f} {capacity / end_to_end / 1e6:>10.1f}")
+
+if __name__ == "__main__":
+    benchmark()
@@ -1,55 +1,50 @@
 from PIL import Image
+import numpy as np
 import os
-
-def encode_udh(image_path, message, output_path):
-    # Open the original image
-    img = Image.open(image_path)
-    encoded = img.copy()
-    width, height = img.size
-
-    # Append null character to signal end of message
-    message += chr(0)
-
-    # Convert the message to binary string
-    binary_message = ''.join(format(ord(char), '08b') for char in message)
-    data_index = 0
-
-    # Loop over pixels
-    for y in range(height):
-        for x in range(width):
-            if data_index >= len(binary_message):
-                break
-
-            r, g, b = img.getpixel((x, y))
-
-            # Encode up to 3 bits per pixel (1 in R, 1 in G, 1 in B)
-            if data_index < len(binary_message):
-                r = (r & ~1) | int(binary_message[data_index])
-                data_index += 1
-            if data_index < len(binary_message):
-                g = (g & ~1) | int(binary_message[data_index])
-                data_index += 1
-            if data_index < len(binary_message):
-                b = (b & ~1) | int(binary_message[data_index])
-                data_index += 1
-
-            encoded.putpixel((x, y), (r, g, b))
-
-        if data_index >= len(binary_message):
-            break
-
-    # Save the encoded image
-    encoded.save(output_path)
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "LSB"))
+from bitplane import payload_bits, lsb_plane, embed_bits
+from streaming import embed_stream
+from scatter import check_streamable, embed_scattered
+
+def encode_udh(image_path, message, output_path, stream=False, bits_per_channel=None, key=None):
+    # Null character is appended to signal end of message; with k bits per
+    # channel a header records k and the length so decode_udh can detect both
+    bits, mask = payload_bits(message, bits_per_channel)
+
+    check_streamable(stream, key)
+
+    if stream:
+        # Strip-by-strip for covers too large to hold decoded in memory
+        embed_stream(image_path, output_path, bits, mask=mask)
+    else:
+        # Open the original image
+        img = Image.open(image_path)
+        if img.mode != 'RGB':
+            img = img.convert('RGB')
+        pixels = np.array(img)
+
+        # Encode k bits per channel (R, G, B) in raster order, or in the
+        # keyed pseudo-random order when a key is given
+        if key is None:
+            embed_bits(lsb_plane(pixels), bits, mask=mask)
+        else:
+            embed_scattered(lsb_plane(pixels), bits, key, mask=mask)
+
+        # Save the encoded image
+        Image.fromarray(pixels).save(output_path)
     print(f"[✓] Message encoded using UDH and saved to: {output_path}")
 
-# --- File Paths ---
-input_image_path = r"C:\cod\yhpargonagets\IS_Graphy\apple.jpg"
-output_dir = r"C:\cod\yhpargonagets\IS_Graphy\UDH"
-os.makedirs(output_dir, exist_ok=True)
-output_image_path = os.path.join(output_dir, "apple_stego_udh.png")
+if __name__ == "__main__":
+    # --- File Paths ---
+    input_image_path = r"C:\cod\yhpargonagets\IS_Graphy\apple.jpg"
+    output_dir = r"C:\cod\yhpargonagets\IS_Graphy\UDH"
+    os.makedirs(output_dir, exist_ok=True)
+    output_image_path = os.path.join(output_dir, "apple_stego_udh.png")
 
-# --- Secret Message ---
-secret_message = "kitty kitty"
+    # --- Secret Message ---
+    secret_message = "kitty kitty"
 
-# --- Run Encoding ---
-encode_udh(input_image_path, secret_message, output_image_path)
+    # --- Run Encoding ---
+    encode_udh(input_image_path, secret_message, output_image_path)
@@ -1,32 +1,21 @@
-from PIL import Image
+import os
+import sys
 
-def decode_udh(image_path):
-    img = Image.open(image_path)
-    binary_data = ""
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "LSB"))
+from scatter import open_reader
 
-    # Read the least significant bits from RGB channels
-    for y in range(img.height):
-        for x in range(img.width):
-            r, g, b = img.getpixel((x, y))
-            binary_data += str(r & 1)
-            binary_data += str(g & 1)
-            binary_data += str(b & 1)
-
-    # Group into 8-bit chunks
-    chars = [binary_data[i:i+8] for i in range(0, len(binary_data), 8)]
-
-    # Convert binary to ASCII, stop at null character
-    message = ""
-    for char in chars:
-        decoded_char = chr(int(char, 2))
-        if decoded_char == chr(0):  # Null terminator used in encoding
-            break
-        message += decoded_char
+def read_udh(image_path, key=None):
+    # Reads until the null character or the length in a k-LSB header
+    return open_reader(image_path, key).read_payload()
 
+def decode_udh(image_path, key=None):
+    message = read_udh(image_path, key)
     print("[✓] Decoded message from UDH stego image:", message)
+    return message
 
-# 🔍 Path to UDH-encoded image
-stego_image_path = r"C:\cod\yhpargonagets\IS_Graphy\UDH\apple_stego_udh.png"
+if __name__ == "__main__":
+    # 🔍 Path to UDH-encoded image
+    stego_image_path = r"C:\cod\yhpargonagets\IS_Graphy\UDH\apple_stego_udh.png"
 
-# 🔓 Run the decoder
-decode_udh(stego_image_path)
+    # 🔓 Run the decoder
+    decode_udh(stego_image_path)
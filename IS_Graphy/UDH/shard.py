@@ -0,0 +1,116 @@
+import argparse
+import hashlib
+import os
+import struct
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from PIL import Image
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "LSB"))
+from bitplane import HEADER_BITS
+from jobpool import image_files
+from lib import encode_udh
+from lib_decode import read_udh
+
+# Splits one payload over several covers. Every shard is a k-LSB UDH
+# message whose body starts with a shard header:
+#   SHARD_MAGIC | payload id (8 bytes) | sequence number | shard count
+# so shards can be extracted in any order and checked for completeness.
+
+SHARD_MAGIC = b'SHRD'
+SHARD_HEADER = struct.Struct('>4s8sII')
+
+def shard_capacity(cover_path, bits_per_channel=1):
+    width, height = Image.open(cover_path).size
+    return (width * height * 3 - HEADER_BITS) * bits_per_channel // 8 - SHARD_HEADER.size
+
+def _embed_shard(cover, blob, output, bits_per_channel, key):
+    encode_udh(cover, blob.decode('latin-1'), output, bits_per_channel=bits_per_channel, key=key)
+    return output
+
+def _extract_shard(path, key):
+    data = read_udh(path, key).encode('latin-1')
+    if len(data) < SHARD_HEADER.size or data[:4] != SHARD_MAGIC:
+        raise ValueError(f"{path} does not carry a payload shard")
+    return SHARD_HEADER.unpack_from(data), data[SHARD_HEADER.size:]
+
+# ---------- EMBEDDING ----------
+def embed_sharded(payload, cover_paths, output_dir, bits_per_channel=1, key=None, workers=None):
+    if isinstance(payload, str):
+        payload = payload.encode('utf-8')
+    payload_id = hashlib.sha256(payload).digest()[:8]
+
+    # Fill covers in order until the payload fits
+    plan, offset = [], 0
+    for cover in cover_paths:
+        if offset >= len(payload):
+            break
+        size = shard_capacity(cover, bits_per_channel)
+        if size > 0:
+            plan.append((cover, payload[offset:offset + size]))
+            offset += size
+    if offset < len(payload):
+        raise ValueError(f"Covers hold {offset} of {len(payload)} payload bytes")
+
+    os.makedirs(output_dir, exist_ok=True)
+    jobs = []
+    for seq, (cover, chunk) in enumerate(plan):
+        stem = os.path.splitext(os.path.basename(cover))[0]
+        output = os.path.join(output_dir, f"{stem}_shard{seq:04d}.png")
+        blob = SHARD_HEADER.pack(SHARD_MAGIC, payload_id, seq, len(plan)) + chunk
+        jobs.append((cover, blob, output))
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_embed_shard, cover, blob, output, bits_per_channel, key)
+                   for cover, blob, output in jobs]
+        outputs = [f.result() for f in futures]
+    print(f"[✓] {len(payload)} bytes split over {len(outputs)} covers in {output_dir}")
+    return outputs
+
+# ---------- EXTRACTION ----------
+def extract_sharded(stego_paths, key=None, workers=None):
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        shards = list(pool.map(_extract_shard, stego_paths, [key] * len(stego_paths)))
+
+    chunks, payload_id, total = {}, None, None
+    for (_, shard_id, seq, count), chunk in shards:
+        if payload_id is None:
+            payload_id, total = shard_id, count
+        elif shard_id != payload_id or count != total:
+            raise ValueError("Shards belong to different payloads")
+        chunks[seq] = chunk
+    if total is None or sorted(chunks) != list(range(total)):
+        missing = sorted(set(range(total or 0)) - set(chunks))
+        raise ValueError(f"Missing shards: {missing}")
+
+    payload = b''.join(chunks[seq] for seq in range(total))
+    if hashlib.sha256(payload).digest()[:8] != payload_id:
+        raise ValueError("Reassembled payload does not match its id")
+    print(f"[✓] Reassembled {len(payload)} bytes from {total} shards")
+    return payload
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Spread a payload over several UDH covers")
+    sub = parser.add_subparsers(dest="command", required=True)
+    embed = sub.add_parser("embed")
+    embed.add_argument("payload", help="File to hide")
+    embed.add_argument("covers", help="Directory of cover images")
+    embed.add_argument("output", help="Directory for the stego shards")
+    embed.add_argument("-k", "--bits-per-channel", type=int, default=1)
+    extract = sub.add_parser("extract")
+    extract.add_argument("stegos", help="Directory of stego shards")
+    extract.add_argument("output", help="File to write the payload to")
+    for p in (embed, extract):
+        p.add_argument("--key")
+        p.add_argument("--workers", type=int)
+    args = parser.parse_args()
+
+    if args.command == "embed":
+        with open(args.payload, 'rb') as f:
+            data = f.read()
+        embed_sharded(data, image_files(args.covers), args.output,
+                      args.bits_per_channel, args.key, args.workers)
+    else:
+        data = extract_sharded(image_files(args.stegos), args.key, args.workers)
+        with open(args.output, 'wb') as f:
+            f.write(data)
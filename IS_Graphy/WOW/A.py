@@ -3,81 +3,100 @@ from tkinter import filedialog, messagebox
 import numpy as np
 import imageio.v3 as iio
 from skimage import img_as_float
-from scipy.signal import convolve2d
+from scipy.ndimage import correlate1d, convolve1d
+from functools import lru_cache, partial
+import pywt
 import os
 
+from cost_lsb import cost_map, keyed_cost_map, embed_message_uint8, extract_message_uint8, extract_message_keyed
+from stc import extract_message_stc
+from hill import compute_rho_HILL
+from jobs import JobRunner, scaled
+
 # ---------- WOW COST FUNCTION ----------
-def compute_rho_WOW(image):
-    filters = [
-        np.array([[1, -1]]),
-        np.array([[1], [-1]]),
-        np.array([[1, 0], [0, -1]])
-    ]
-    rho = np.zeros_like(image)
-    for filt in filters:
-        residual = convolve2d(image, filt, mode='same', boundary='symm')
-        abs_res = np.abs(residual)
-        rho += 1.0 / (abs_res + 1e-5)
-    return rho / np.max(rho)
+@lru_cache(maxsize=None)
+def wow_filter_bank(wavelet='db4'):
+    # Directional filters LH, HL, HH as (column filter, row filter) pairs of
+    # the Daubechies decomposition filters; each 2-D kernel is their outer
+    # product, so every convolution runs as two 1-D passes.
+    w = pywt.Wavelet(wavelet)
+    lo = np.array(w.dec_lo, dtype=np.float64)
+    hi = np.array(w.dec_hi, dtype=np.float64)
+    return ((lo, hi), (hi, lo), (hi, hi))
+
+def compute_rho_WOW(image, wavelet='db4', p=-1.0, progress=None):
+    # Filtering runs in float64: float32 rounding leaves residuals of about
+    # 1e-8 in flat regions, which would swamp the 1e-10 stabiliser below.
+    image = np.asarray(image, dtype=np.float64)
+    xi_sum = np.zeros_like(image)
+    row_passes = {}
+    for direction, (col, row) in enumerate(wow_filter_bank(wavelet)):
+        if progress:
+            progress(direction / 3)
+        # Residual R = X * K is a true convolution; xi = |R| * rot180(|K|)
+        # convolves with the flipped kernel, i.e. correlates with |K|.
+        # LH and HH share their row filter, so that pass is done once.
+        if id(row) not in row_passes:
+            row_passes[id(row)] = convolve1d(image, row, axis=1, mode='reflect')
+        residual = convolve1d(row_passes[id(row)], col, axis=0, mode='reflect')
+        np.abs(residual, out=residual)
+        xi = correlate1d(correlate1d(residual, np.abs(row), axis=1, mode='reflect'), np.abs(col), axis=0, mode='reflect')
+        xi += 1e-10
+        xi_sum += np.reciprocal(xi) if p == -1 else np.power(xi, p)
+    # Hölder-norm aggregation; p = -1 is dominated by the most predictable direction
+    rho = xi_sum if p == -1 else np.power(xi_sum, -1.0 / p)
+    return (rho / np.max(rho)).astype(np.float32)
 
 # ---------- EMBEDDING & EXTRACTION ----------
-def embed_message_uint8(image_uint8, message, costs):
-    flat_img = image_uint8.flatten()
-    flat_costs = costs.flatten()
-
-    message_length = len(message)
-    length_bits = f'{message_length:016b}'
-    message_bits = length_bits + ''.join(f'{ord(c):08b}' for c in message)
-
-    sorted_indices = np.argsort(flat_costs)
-
-    for i, bit in enumerate(message_bits):
-        idx = sorted_indices[i]
-        pixel = flat_img[idx]
-        if (pixel & 1) != int(bit):
-            flat_img[idx] ^= 1  # Flip LSB
-
-    return flat_img.reshape(image_uint8.shape), sorted_indices
+# Cost maps offered by the GUI: cache name, function and parameters
+COST_FUNCTIONS = {
+    'WOW': ('wow-conv', compute_rho_WOW, {'wavelet': 'db4', 'p': -1.0}),
+    'HILL': ('hill', compute_rho_HILL, {'l1': 3, 'l2': 15}),
+}
 
-def extract_message_uint8(image_uint8, sorted_indices):
-    flat_img = image_uint8.flatten()
+def image_costs(image, method='WOW', progress=None):
+    return cost_map(image, COST_FUNCTIONS[method], progress)
 
-    # Get length first (16 bits)
-    bits = ''
-    for i in range(16):
-        idx = sorted_indices[i]
-        bits += str(flat_img[idx] & 1)
-    message_length = int(bits, 2)
-
-    # Extract message
-    bits = ''
-    for i in range(16, 16 + message_length * 8):
-        idx = sorted_indices[i]
-        bits += str(flat_img[idx] & 1)
-
-    chars = [chr(int(bits[i:i+8], 2)) for i in range(0, len(bits), 8)]
-    return ''.join(chars)
+def keyed_costs(image_uint8, method='WOW', progress=None):
+    return keyed_cost_map(image_uint8, COST_FUNCTIONS[method], progress)
 
 # ---------- GUI ----------
 class StegoGUI:
     def __init__(self, master):
         self.master = master
         master.title("WOW Steganography (RGB + Auto-Length + External Stego)")
-        master.geometry("650x480")
-        self.image = None
-        self.gray_image = None
-        self.costs = None
-        self.gray_uint8 = None
+        master.geometry("650x680")
+        self.covers = {}  # file name -> loaded cover, one entry per cover
 
         tk.Label(master, text="WOW Steganography GUI", font=("Arial", 16)).pack(pady=10)
 
-        self.load_button = tk.Button(master, text="Load Cover Image (RGB or Gray)", command=self.load_image)
+        self.load_button = tk.Button(master, text="Load Cover Image(s) (RGB or Gray)", command=self.load_image)
         self.load_button.pack(pady=5)
 
+        self.cover_var = tk.StringVar(value="")
+        cover_row = tk.Frame(master)
+        cover_row.pack()
+        tk.Label(cover_row, text="Embed into:").pack(side=tk.LEFT)
+        self.cover_menu = tk.OptionMenu(cover_row, self.cover_var, "")
+        self.cover_menu.pack(side=tk.LEFT)
+
         self.message_entry = tk.Entry(master, width=50)
         self.message_entry.pack(pady=5)
         self.message_entry.insert(0, "Enter your secret message here")
 
+        tk.Label(master, text="Key (leave empty to use an order file):").pack()
+        self.key_entry = tk.Entry(master, width=50, show="*")
+        self.key_entry.pack(pady=5)
+
+        self.cost_var = tk.StringVar(value='WOW')
+        cost_row = tk.Frame(master)
+        cost_row.pack()
+        tk.Label(cost_row, text="Cost function:").pack(side=tk.LEFT)
+        tk.OptionMenu(cost_row, self.cost_var, *COST_FUNCTIONS).pack(side=tk.LEFT)
+
+        self.stc_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(master, text="Syndrome-trellis coding (no order file)", variable=self.stc_var).pack()
+
         self.embed_button = tk.Button(master, text="Embed and Save Stego Image", command=self.embed)
         self.embed_button.pack(pady=5)
 
@@ -89,52 +108,103 @@ class StegoGUI:
         self.output_label = tk.Label(master, text="", font=("Arial", 12))
         self.output_label.pack(pady=10)
 
+        self.jobs = JobRunner(master)
+
     def load_image(self):
-        file_path = filedialog.askopenfilename(title="Select Cover Image")
-        if file_path:
-            image = iio.imread(file_path)
-            if image.ndim == 3 and image.shape[2] == 3:
-                gray = np.dot(image[..., :3], [0.299, 0.587, 0.114])
-            else:
-                gray = image if image.ndim == 2 else image[:, :, 0]
-            gray_float = img_as_float(gray)
-            self.gray_image = gray_float
-            self.gray_uint8 = (gray_float * 255).astype(np.uint8)
-            self.costs = compute_rho_WOW(gray_float)
-            messagebox.showinfo("Success", "Cover image loaded and WOW cost map calculated.")
+        # Several covers can be picked; each is loaded and costed in turn on
+        # the worker and added to the cover menu when it is ready.
+        for file_path in filedialog.askopenfilenames(title="Select Cover Image"):
+            self.jobs.submit(f"Loading {os.path.basename(file_path)}",
+                             partial(self._load_job, file_path, self.cost_var.get()),
+                             on_done=self._cover_loaded,
+                             on_error=lambda e: messagebox.showerror("Error", f"Loading failed: {str(e)}"))
+
+    def _load_job(self, file_path, method, progress):
+        # Runs on the worker and only returns the cover; the Tk thread stores it
+        progress(0.05, "reading")
+        image = iio.imread(file_path)
+        if image.ndim == 3 and image.shape[2] == 3:
+            gray = np.dot(image[..., :3], [0.299, 0.587, 0.114])
+        else:
+            gray = image if image.ndim == 2 else image[:, :, 0]
+        gray_float = img_as_float(gray)
+        costs = image_costs(gray_float, method, progress=scaled(progress, 0.1, 1.0, "computing costs"))
+        progress(1.0, "WOW cost map ready")
+        return {"name": os.path.basename(file_path), "gray": gray_float,
+                "uint8": (gray_float * 255).astype(np.uint8), "costs": {method: costs}}
+
+    def _cover_loaded(self, cover):
+        self.covers[cover["name"]] = cover
+        menu = self.cover_menu["menu"]
+        menu.delete(0, tk.END)
+        for name in self.covers:
+            menu.add_command(label=name, command=tk._setit(self.cover_var, name))
+        self.cover_var.set(cover["name"])
+        self.output_label.config(text=f"Cover loaded: {cover['name']}")
 
     def embed(self):
-        if self.gray_image is None:
-            messagebox.showerror("Error", "Load a cover image first.")
-            return
-
         message = self.message_entry.get()
         if not message:
             messagebox.showerror("Error", "Enter a secret message.")
             return
+        cover = self.covers.get(self.cover_var.get())
+        if cover is None:
+            messagebox.showerror("Error", "Load a cover image first.")
+            return
 
-        try:
-            stego_uint8, sorted_indices = embed_message_uint8(self.gray_uint8.copy(), message, self.costs)
-            output_dir = os.path.dirname(__file__)
-            iio.imwrite(f"{output_dir}/stego_image.png", stego_uint8)
-            np.save(f"{output_dir}/stego_order.npy", sorted_indices)
-            messagebox.showinfo("Success", "Message embedded and saved as stego_image.png + stego_order.npy.")
-        except Exception as e:
-            messagebox.showerror("Embedding Failed", str(e))
+        self.jobs.submit(f"Embedding into {cover['name']}",
+                         partial(self._embed_job, cover, message, self.key_entry.get() or None,
+                                 self.cost_var.get(), self.stc_var.get()),
+                         on_done=lambda text: messagebox.showinfo("Success", text),
+                         on_error=lambda e: messagebox.showerror("Embedding Failed", str(e)))
+
+    def _embed_job(self, cover, message, key, method, use_stc, progress):
+        if key and not use_stc:
+            # Keyed mode: the receiver recomputes the order, no sidecar, and
+            # the payload is encrypted with the key
+            costs = keyed_costs(cover["uint8"], method, progress=scaled(progress, 0.0, 0.5, "computing costs"))
+        else:
+            costs = cover["costs"].get(method)
+            if costs is None:
+                costs = image_costs(cover["gray"], method, progress=scaled(progress, 0.0, 0.5, "computing costs"))
+        stego_uint8, sorted_indices = embed_message_uint8(cover["uint8"].copy(), message, costs, key, stc=use_stc,
+                                                          progress=scaled(progress, 0.5, 0.9, "embedding"))
+        progress(0.9, "writing")
+        output_dir = os.path.dirname(__file__)
+        stem = "stego_" + os.path.splitext(cover["name"])[0]
+        iio.imwrite(f"{output_dir}/{stem}.png", stego_uint8)
+        if use_stc or key:
+            how = "with STC" if use_stc else "with key"
+            return f"Message embedded {how} and saved as {stem}.png."
+        np.save(f"{output_dir}/{stem}_order.npy", sorted_indices)
+        return f"Message embedded and saved as {stem}.png + {stem}_order.npy."
 
     def load_stego_and_extract(self):
         file_path = filedialog.askopenfilename(title="Select Stego Image")
-        if file_path:
-            try:
-                stego_uint8 = iio.imread(file_path, mode='L')
-                sorted_indices_path = filedialog.askopenfilename(title="Select Matching stego_order.npy")
-                if not sorted_indices_path.endswith(".npy"):
-                    raise ValueError("You must select a valid .npy file.")
-                sorted_indices = np.load(sorted_indices_path)
-                message = extract_message_uint8(stego_uint8, sorted_indices)
-                self.output_label.config(text=f"Recovered Message: {message}")
-            except Exception as e:
-                messagebox.showerror("Error", f"Extraction failed: {str(e)}")
+        if not file_path:
+            return
+        key = self.key_entry.get()
+        sorted_indices_path = None
+        if not self.stc_var.get() and not key:
+            sorted_indices_path = filedialog.askopenfilename(title="Select Matching Order File (.npy)")
+            if not sorted_indices_path.endswith(".npy"):
+                messagebox.showerror("Error", "Extraction failed: You must select a valid .npy file.")
+                return
+        self.jobs.submit(f"Extracting {os.path.basename(file_path)}",
+                         partial(self._extract_job, file_path, key, self.cost_var.get(),
+                                 self.stc_var.get(), sorted_indices_path),
+                         on_done=lambda message: self.output_label.config(text=f"Recovered Message: {message}"),
+                         on_error=lambda e: messagebox.showerror("Error", f"Extraction failed: {str(e)}"))
+
+    def _extract_job(self, file_path, key, method, use_stc, sorted_indices_path, progress):
+        stego_uint8 = iio.imread(file_path, mode='L')
+        progress(0.3, "decoding")
+        if use_stc:
+            return extract_message_stc(stego_uint8, key or None)
+        if key:
+            return extract_message_keyed(stego_uint8, key, COST_FUNCTIONS[method],
+                                         scaled(progress, 0.3, 1.0, "computing costs"))
+        return extract_message_uint8(stego_uint8, np.load(sorted_indices_path))
 
 # ---------- RUN ----------
 if __name__ == "__main__":
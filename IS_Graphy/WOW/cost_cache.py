@@ -0,0 +1,69 @@
+import hashlib
+import os
+import tempfile
+import numpy as np
+
+# On-disk cache of cost maps shared by the WOW and S-UNIWARD GUIs. Entries are
+# keyed by a hash of the cover pixels plus the cost function name and its
+# parameters, stored as .npy files and handed back memory-mapped, so opening a
+# known cover again skips the cost computation. Hits refresh the file's mtime
+# and the oldest entries are evicted once the cache grows past its budget.
+
+CACHE_DIR = os.environ.get(
+    "STEGO_COST_CACHE", os.path.join(os.path.expanduser("~"), ".cache", "yhpargonagets", "costs"))
+MAX_BYTES = 2 << 30
+
+def cost_key(image, name, **params):
+    image = np.ascontiguousarray(image)
+    h = hashlib.sha256()
+    h.update(f"{name}|{image.dtype.str}|{image.shape}|{sorted(params.items())}".encode("utf-8"))
+    h.update(memoryview(image).cast("B"))
+    return h.hexdigest()
+
+def _evict(cache_dir, max_bytes, keep):
+    entries = []
+    for name in os.listdir(cache_dir):
+        if name.endswith(".npy"):
+            path = os.path.join(cache_dir, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            entries.append((st.st_mtime_ns, st.st_size, path))
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        if path == keep:
+            continue
+        try:
+            os.remove(path)
+            total -= size
+        except OSError:
+            pass  # still mapped by another process (Windows)
+
+def cached_costs(name, func, image, cache_dir=None, max_bytes=MAX_BYTES, progress=None, **params):
+    # Returns func(image, **params), from disk when this cover was seen before.
+    # progress, if given, is passed on to func and is not part of the key.
+    cache_dir = cache_dir or CACHE_DIR
+    path = os.path.join(cache_dir, f"{name}-{cost_key(image, name, **params)}.npy")
+    try:
+        costs = np.load(path, mmap_mode="r")
+        os.utime(path)
+        return costs
+    except (OSError, ValueError):
+        pass
+
+    costs = func(image, **params) if progress is None else func(image, progress=progress, **params)
+    os.makedirs(cache_dir, exist_ok=True)
+    # Written under a temporary name so readers never see a partial file
+    fd, temp_path = tempfile.mkstemp(suffix=".tmp", dir=cache_dir)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.save(f, np.asarray(costs))
+        os.replace(temp_path, path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    _evict(cache_dir, max_bytes, path)
+    return np.load(path, mmap_mode="r")
@@ -0,0 +1,96 @@
+import hashlib
+import os
+import sys
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "LSB"))
+from scatter import KeyedPermutation
+from cost_cache import cached_costs
+from stc import embed_message_stc
+
+# Cost-ordered LSB embedding shared by the WOW and S-UNIWARD GUIs. A cost
+# method is given as (cache name, function, parameters); each script keeps
+# its own table of them. The payload is a 16-bit length prefix followed by
+# 8 bits per character, written into the cheapest pixels in cost order.
+# With a key the whole payload, length prefix included, is XORed with a
+# keystream derived from it, so a wrong key reads back noise.
+
+def lsb_invariant(image_uint8):
+    # Pixels with their LSBs cleared: identical for a cover and its stego
+    # image, so the receiver can recompute the same cost map.
+    return (image_uint8 & 0xFE).astype(np.float32) / 255
+
+def cost_map(image, method, progress=None):
+    name, func, params = method
+    return cached_costs(name, func, image, progress=progress, **params)
+
+def keyed_cost_map(image_uint8, method, progress=None):
+    return cost_map(lsb_invariant(image_uint8), method, progress)
+
+def keystream_bits(key, n, count):
+    # First count bits of the keystream for key on an n-pixel cover
+    if isinstance(key, str):
+        key = key.encode('utf-8')
+    stream = hashlib.shake_256(b'cost-lsb|' + key + n.to_bytes(8, 'big')).digest((count + 7) // 8)
+    return np.unpackbits(np.frombuffer(stream, dtype=np.uint8))[:count]
+
+def cheapest_indices(costs, count, key=None):
+    # The count lowest-cost positions in ascending cost order. argpartition
+    # selects them in linear time; only the chosen subset is sorted.
+    flat_costs = np.asarray(costs).ravel()
+    if count > flat_costs.size:
+        raise ValueError("Message too long for the image")
+    if key is not None:
+        # Keyed mode sorts on a unique uint64: the float32 cost bits (monotone
+        # for non-negative costs) above a keyed permutation of the index, so
+        # ties are broken the same way on both ends without an order file.
+        cost_bits = flat_costs.astype(np.float32).view(np.uint32).astype(np.uint64)
+        tie_break = KeyedPermutation(flat_costs.size, key)(np.arange(flat_costs.size, dtype=np.uint64))
+        flat_costs = (cost_bits << np.uint64(32)) | tie_break.astype(np.uint64)
+    if count < flat_costs.size:
+        chosen = np.argpartition(flat_costs, count - 1)[:count]
+    else:
+        chosen = np.arange(flat_costs.size)
+    return chosen[np.argsort(flat_costs[chosen], kind='stable')]
+
+def embed_message_uint8(image_uint8, message, costs, key=None, stc=False, workers=1, progress=None):
+    if stc:
+        # Syndrome-trellis coding; the receiver needs no order, only the key
+        return embed_message_stc(image_uint8, message, costs, key, workers=workers, progress=progress), None
+
+    flat_img = image_uint8.flatten()
+
+    # 16-bit length prefix followed by 8 bits per character
+    payload = len(message).to_bytes(2, 'big') + message.encode('latin-1')
+    message_bits = np.unpackbits(np.frombuffer(payload, dtype=np.uint8))
+
+    if key is not None:
+        message_bits ^= keystream_bits(key, flat_img.size, len(message_bits))
+
+    used_indices = cheapest_indices(costs, len(message_bits), key)
+    flat_img[used_indices] = (flat_img[used_indices] & 0xFE) | message_bits
+
+    return flat_img.reshape(image_uint8.shape), used_indices
+
+def extract_message_uint8(image_uint8, sorted_indices):
+    flat_img = image_uint8.ravel()
+
+    # Read 16-bit length prefix
+    length_bits = flat_img[sorted_indices[:16]] & 1
+    message_length = int.from_bytes(np.packbits(length_bits).tobytes(), 'big')
+
+    bits = flat_img[sorted_indices[16:16 + message_length * 8]] & 1
+    return np.packbits(bits).tobytes().decode('latin-1')
+
+def extract_message_keyed(image_uint8, key, method, progress=None):
+    # No order file: costs come from the LSB-invariant stego image and the
+    # key, and the length prefix sits in the 16 cheapest positions.
+    flat_img = image_uint8.ravel()
+    costs = keyed_cost_map(image_uint8, method, progress)
+    length_bits = (flat_img[cheapest_indices(costs, 16, key)] & 1) ^ keystream_bits(key, flat_img.size, 16)
+    message_length = int.from_bytes(np.packbits(length_bits).tobytes(), 'big')
+    count = 16 + message_length * 8
+    if count > flat_img.size:
+        raise ValueError("No message found for this key")
+    bits = (flat_img[cheapest_indices(costs, count, key)] & 1) ^ keystream_bits(key, flat_img.size, count)
+    return np.packbits(bits[16:]).tobytes().decode('latin-1')
@@ -0,0 +1,27 @@
+import numpy as np
+from scipy.ndimage import correlate1d, uniform_filter1d
+
+# HILL cost: residual of the KB high-pass filter, spread by a small box
+# filter, inverted, then spread again by a large box filter. KB is the outer
+# product of [-1, 2, -1] with itself (up to sign and scale) and both low-pass
+# filters are separable box means computed with running sums, so every pass
+# is 1-D and the cost is O(N) whatever the filter sizes.
+
+KB_TAPS = np.array([-1, 2, -1], dtype=np.float32) / 2
+
+def box_filter(a, size):
+    a = uniform_filter1d(a, size, axis=0, mode='reflect')
+    return uniform_filter1d(a, size, axis=1, mode='reflect', output=a)
+
+def compute_rho_HILL(image, l1=3, l2=15, progress=None):
+    image = np.asarray(image, dtype=np.float32)
+    residual = correlate1d(correlate1d(image, KB_TAPS, axis=1, mode='reflect'), KB_TAPS, axis=0, mode='reflect')
+    np.abs(residual, out=residual)
+    if progress:
+        progress(1 / 3)
+    xi = box_filter(residual, l1)
+    xi += 1e-10
+    if progress:
+        progress(2 / 3)
+    rho = box_filter(np.reciprocal(xi, out=xi), l2)
+    return rho / np.max(rho)
@@ -0,0 +1,106 @@
+import queue
+import threading
+import tkinter as tk
+from tkinter import ttk
+
+# Background work for the WOW and S-UNIWARD GUIs. Jobs run one after another
+# on a worker thread, so covers can be queued while earlier ones are still
+# being processed. The worker never touches Tk: progress and results go
+# through a queue that the Tk thread drains with after(). Long steps take
+# the progress callback into their inner loops, which is where cancel()
+# takes effect.
+
+POLL_MS = 100
+
+class JobCancelled(Exception):
+    pass
+
+def scaled(progress, start, stop, text=None):
+    # progress(fraction) callback for a step covering [start, stop] of a job,
+    # for handing to cost functions and the STC engine
+    return lambda fraction: progress(start + (stop - start) * fraction, text)
+
+class JobRunner:
+    def __init__(self, master):
+        self.master = master
+        self._jobs = queue.Queue()
+        self._events = queue.Queue()
+        self._generation = 0  # bumped by cancel(); older jobs are dropped
+        self._pending = 0
+        self._current = "Idle"
+
+        row = tk.Frame(master)
+        row.pack(pady=5)
+        self.progress = ttk.Progressbar(row, length=380, maximum=1.0)
+        self.progress.pack(side=tk.LEFT, padx=5)
+        self.cancel_button = tk.Button(row, text="Cancel", command=self.cancel, state=tk.DISABLED)
+        self.cancel_button.pack(side=tk.LEFT)
+        self.status = tk.Label(master, text="Idle")
+        self.status.pack()
+
+        threading.Thread(target=self._work, daemon=True).start()
+        master.after(POLL_MS, self._poll)
+
+    def submit(self, label, func, on_done=None, on_error=None):
+        # func(progress) runs on the worker thread and may call
+        # progress(fraction, text); on_done(result) / on_error(exc) run on
+        # the Tk thread.
+        self._pending += 1
+        self._jobs.put((self._generation, label, func, on_done, on_error))
+        self.cancel_button.config(state=tk.NORMAL)
+        self._show()
+
+    def cancel(self):
+        # Drops every queued job; the running one stops at its next progress call
+        self._generation += 1
+
+    def _work(self):
+        while True:
+            generation, label, func, on_done, on_error = self._jobs.get()
+
+            def progress(fraction, text=None):
+                if generation != self._generation:
+                    raise JobCancelled
+                self._events.put(("progress", fraction, f"{label}: {text}" if text else label, None))
+
+            try:
+                progress(0.0)
+                result = func(progress)
+                if generation != self._generation:
+                    raise JobCancelled
+                self._events.put(("done", result, label, on_done))
+            except JobCancelled:
+                self._events.put(("cancelled", None, label, None))
+            except Exception as e:
+                self._events.put(("error", e, label, on_error))
+
+    def _show(self, text=None):
+        self._current = text or self._current
+        queued = self._pending - 1
+        self.status.config(text=f"{self._current} ({queued} queued)" if queued > 0 else self._current)
+
+    def _poll(self):
+        try:
+            while True:
+                kind, value, text, callback = self._events.get_nowait()
+                if kind == "progress":
+                    self.progress["value"] = value
+                    self._show(text)
+                    continue
+                self._pending -= 1
+                self.progress["value"] = 0
+                if kind == "cancelled":
+                    self._show(f"{text}: cancelled")
+                elif kind == "error":
+                    self._show(f"{text}: failed")
+                    if callback:
+                        callback(value)
+                else:
+                    self._show(f"{text}: done")
+                    if callback:
+                        callback(value)
+                if self._pending == 0:
+                    self.cancel_button.config(state=tk.DISABLED)
+        except queue.Empty:
+            pass
+        self.master.after(POLL_MS, self._poll)
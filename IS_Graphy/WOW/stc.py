@@ -0,0 +1,278 @@
+import importlib.util
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from PIL import Image
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "LSB"))
+from scatter import KeyedPermutation
+
+# Syndrome-trellis codes for the cost-based embedders. The message is the
+# syndrome H*y of the stego LSBs, where H is built from an h x w submatrix
+# slid down the diagonal. A Viterbi pass over the cost profile finds the
+# cheapest y with that syndrome, so far fewer, and cheaper, pixels change
+# than with one-for-one LSB replacement.
+#
+# The message is cut into equal chunks that are coded independently. Groups
+# of chunks run through the trellis together (NumPy works across the chunk
+# axis), and groups can be spread over processes. Chunks are as long as
+# CHUNK_BITS once there are TARGET_CHUNKS of them; shorter messages use
+# shorter chunks, down to MIN_CHUNK_BITS, so the chunk axis stays wide.
+#
+# Each chunk's trellis is capped at MAX_STEPS cover bits: a short message only
+# uses a keyed prefix of the cover, so the trellis stays short and the chunk
+# axis wide instead of running one huge chunk over every pixel. Short chunks
+# let a short message still draw on a wide prefix, and so on cheap pixels.
+#
+# Image layout: cover positions come from a keyed permutation. The first
+# header span of them carries the payload length, STC-coded like the payload
+# so the header bits also land on cheap pixels rather than on whatever pixels
+# the key picks; the payload STC uses the prefix that follows, whose length
+# layout() derives from the payload length.
+
+CONSTRAINT_HEIGHT = 7
+CHUNK_BITS = 512
+MIN_CHUNK_BITS = 32
+TARGET_CHUNKS = 256
+GROUP_CHUNKS = 512
+MAX_STEPS = 1 << 14
+HEADER_BITS = 16
+
+def submatrix(h, w):
+    # Columns as h-bit integers (bit r = row r); top and bottom rows are
+    # always set so every column touches the current and the last row.
+    rng = np.random.default_rng((h << 16) | w)
+    cols = rng.integers(0, 1 << h, size=w, dtype=np.int64)
+    return cols | 1 | (1 << (h - 1))
+
+def layout(n_cover, n_message, max_steps=MAX_STEPS):
+    # (chunks, message bits per chunk, cover bits per message bit)
+    target = min(CHUNK_BITS, max(MIN_CHUNK_BITS, n_message // TARGET_CHUNKS))
+    chunks = -(-n_message // target)
+    length = -(-n_message // chunks)
+    w = n_cover // (chunks * length)
+    if w < 1:
+        raise ValueError("Message too long for the image")
+    return chunks, length, min(w, max(1, max_steps // length)) if max_steps else w
+
+def _viterbi(x, rho, m, cols, h, progress=None):
+    # x, rho: (chunks, length * w) cover bits and flip costs, m: (chunks, length).
+    # The trellis is kept as (states, chunks) so every step works on whole rows.
+    # progress(fraction) is called once per message row of the forward pass.
+    B, L = m.shape
+    w = len(cols)
+    S = 1 << h
+    states = np.arange(S)
+    # Path costs are sums of the non-negative flip cost rho * (x ^ y) in
+    # float64, with the cheapest state of each chunk subtracted after every
+    # row. Costs span many orders of magnitude (S-UNIWARD reaches 1e6,
+    # HILL goes below 1e-9), so a float32 running total loses the cheap
+    # pixels and the trellis ends up choosing almost at random.
+    rho = np.asarray(rho, dtype=np.float64)
+    keep_cost = np.ascontiguousarray((rho * x).T)
+    flip_cost = np.ascontiguousarray((rho * (1 - x)).T)
+    m_rows = np.ascontiguousarray(m.T, dtype=np.int64)
+    keep = (states[:S // 2] << 1)[:, None]
+    # Predecessor state of every state for each column, and for the columns
+    # of the last h - 1 rows, whose bits past the end of the chunk are dropped
+    full = states[None, :] ^ cols[:, None]
+    tails = {rows: states[None, :] ^ (cols[:, None] & ((1 << rows) - 1)) for rows in range(1, min(h, L + 1))}
+
+    cost = np.full((S, B), np.inf)
+    cost[0] = 0
+    c1 = np.empty_like(cost)
+    choice = np.empty((w, S, B), dtype=bool)
+    path = np.empty((L, w, (S * B + 7) // 8), dtype=np.uint8)
+    for i in range(L):
+        pred = tails.get(L - i, full)
+        for k in range(w):
+            cost.take(pred[k], axis=0, out=c1)
+            c1 += flip_cost[i * w + k]
+            cost += keep_cost[i * w + k]
+            np.less(c1, cost, out=choice[k])
+            np.minimum(cost, c1, out=cost)
+        path[i] = np.packbits(choice.reshape(w, -1), axis=1)
+        # Row i is complete: keep states whose low bit is the message bit
+        cost[:S // 2] = np.take_along_axis(cost, keep | m_rows[i], axis=0)
+        cost[S // 2:] = np.inf
+        cost -= cost[:S // 2].min(axis=0)
+        if progress:
+            progress((i + 1) / L)
+
+    y = np.empty((L * w, B), dtype=bool)
+    chunk = np.arange(B)
+    state = np.argmin(cost, axis=0)
+    for i in reversed(range(L)):
+        pred = tails.get(L - i, full)
+        state = (state << 1) | m_rows[i]
+        # One row of choices unpacked at a time, so each column is a single lookup
+        choice = np.unpackbits(path[i], axis=1, count=S * B).reshape(w, S, B).view(bool)
+        for k in reversed(range(w)):
+            bit = choice[k, state, chunk]
+            y[i * w + k] = bit
+            state = np.where(bit, pred[k, state], state)
+    return y.T.astype(np.uint8)
+
+def syndrome(y, cols, h, length):
+    # H*y for every chunk; y is (chunks, length * w)
+    Y = y.reshape(y.shape[0], length, len(cols))
+    m = np.zeros((y.shape[0], length), dtype=np.uint8)
+    for r in range(h):
+        taps = ((cols >> r) & 1).astype(bool)
+        if taps.any() and r < length:
+            m[:, r:] ^= np.bitwise_xor.reduce(Y[:, :, taps], axis=2)[:, :length - r]
+    return m
+
+def stc_embed(cover_bits, rho, message_bits, h=CONSTRAINT_HEIGHT, workers=1, progress=None):
+    # Returns the stego bits for the first chunks * length * w cover bits.
+    # progress is only reported when the groups run in this process.
+    chunks, length, w = layout(len(cover_bits), len(message_bits))
+    cols = submatrix(h, w)
+    used = chunks * length * w
+    x = np.asarray(cover_bits[:used], dtype=np.uint8).reshape(chunks, -1)
+    r = np.asarray(rho[:used], dtype=np.float64).reshape(chunks, -1)
+    m = np.zeros(chunks * length, dtype=np.uint8)
+    m[:len(message_bits)] = message_bits  # last chunk is zero padded
+    m = m.reshape(chunks, length)
+
+    groups = [slice(g, g + GROUP_CHUNKS) for g in range(0, chunks, GROUP_CHUNKS)]
+    args = [(x[g], r[g], m[g], cols, h) for g in groups]
+    if workers == 1 or len(groups) == 1:
+        parts = []
+        for g, a in enumerate(args):
+            step = None if progress is None else (lambda f, g=g: progress((g + f) / len(args)))
+            parts.append(_viterbi(*a, progress=step))
+    else:
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+            parts = list(pool.map(_viterbi, *zip(*args)))
+    return np.concatenate(parts).ravel()
+
+def stc_extract(stego_bits, n_message, h=CONSTRAINT_HEIGHT):
+    # stego_bits is exactly the embedded prefix, so its length fixes the rate
+    chunks, length, w = layout(len(stego_bits), n_message, max_steps=None)
+    y = np.asarray(stego_bits[:chunks * length * w], dtype=np.uint8).reshape(chunks, -1)
+    return syndrome(y, submatrix(h, w), h, length).ravel()[:n_message]
+
+# ---------- IMAGE LEVEL ----------
+def _positions(n, key, start, stop):
+    # Keyed cover slots [start, stop), permuted on the fly
+    return KeyedPermutation(n, key or b'stc')(np.arange(start, stop, dtype=np.uint64))
+
+def _header_bits(length):
+    if length >> HEADER_BITS:
+        raise ValueError("Message too long for the image")
+    return np.unpackbits(np.frombuffer(length.to_bytes(HEADER_BITS // 8, 'big'), dtype=np.uint8))
+
+def _prefix(n, span, length):
+    # Cover slots taken by the payload STC after the header span
+    chunks, rows, w = layout(n - span, length * 8)
+    return chunks * rows * w
+
+def _header_span(n):
+    # Cover slots given to the header: one chunk of MAX_STEPS, less on
+    # covers too small to spare a quarter of their pixels for it
+    return HEADER_BITS * max(1, min(MAX_STEPS // HEADER_BITS, n // (4 * HEADER_BITS)))
+
+def embed_message_stc(image_uint8, message, costs, key=None, h=CONSTRAINT_HEIGHT, workers=1, progress=None):
+    flat_img = image_uint8.flatten()
+    flat_costs = np.asarray(costs).ravel()
+    payload = message.encode('latin-1')
+    message_bits = np.unpackbits(np.frombuffer(payload, dtype=np.uint8))
+    span = _header_span(flat_img.size)
+
+    if len(message_bits):
+        prefix = _prefix(flat_img.size, span, len(payload))
+        cover = _positions(flat_img.size, key, span, span + prefix)
+        y = stc_embed(flat_img[cover] & 1, flat_costs[cover], message_bits, h, workers, progress)
+        flat_img[cover] = (flat_img[cover] & 0xFE) | y
+
+    header = _positions(flat_img.size, key, 0, span)
+    y = stc_embed(flat_img[header] & 1, flat_costs[header], _header_bits(len(payload)), h)
+    flat_img[header] = (flat_img[header] & 0xFE) | y
+    return flat_img.reshape(image_uint8.shape)
+
+def extract_message_stc(image_uint8, key=None, h=CONSTRAINT_HEIGHT):
+    flat_img = image_uint8.ravel()
+    span = _header_span(flat_img.size)
+    header_bits = stc_extract(flat_img[_positions(flat_img.size, key, 0, span)] & 1, HEADER_BITS, h)
+    length = int.from_bytes(np.packbits(header_bits).tobytes(), 'big')
+    if length == 0:
+        return ''
+    try:
+        prefix = _prefix(flat_img.size, span, length)
+    except ValueError:
+        raise ValueError("No STC message found for this key")
+    bits = stc_extract(flat_img[_positions(flat_img.size, key, span, span + prefix)] & 1, length * 8, h)
+    return np.packbits(bits).tobytes().decode('latin-1')
+
+# ---------- TIMING CHECK ----------
+def benchmark(shape=(2048, 2048), message_chars=(1, 20, 500, 4000, 20000), short=20, limit=1.0, seed=0):
+    # Embeds random messages into a random cover and checks the round trip;
+    # messages up to short characters must embed within limit seconds.
+    rng = np.random.default_rng(seed)
+    cover = rng.integers(0, 256, shape, dtype=np.uint8)
+    costs = rng.random(shape, dtype=np.float32) + 0.01
+    slow = []
+    for chars in message_chars:
+        message = ''.join(map(chr, rng.integers(32, 127, chars)))
+        start = time.perf_counter()
+        stego = embed_message_stc(cover.copy(), message, costs, b'bench')
+        seconds = time.perf_counter() - start
+        chunks, length, w = layout(cover.size - _header_span(cover.size), chars * 8)
+        ok = extract_message_stc(stego, b'bench') == message
+        if chars <= short and seconds > limit:
+            slow.append(chars)
+        print(f"[{'✓' if ok else '✗'}] {chars:6d} chars: {seconds:.3f}s, {chunks * length * w / seconds / 1e6:.2f} Mbit/s "
+              f"of cover ({chunks} chunks x {length} bits, w={w}, {int((stego != cover).sum())} changes)")
+    if slow:
+        raise RuntimeError(f"Short messages took over {limit}s: {slow} chars")
+
+# ---------- DISTORTION CHECK ----------
+def _real_cost_functions():
+    # WOW and HILL from this folder and S-UNIWARD from its own. Both GUI
+    # scripts are named A.py, so S-UNIWARD's is loaded under another name.
+    from A import compute_rho_WOW
+    from hill import compute_rho_HILL
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "S-UNIWARD", "A.py")
+    spec = importlib.util.spec_from_file_location("suniward_gui", path)
+    suniward = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(suniward)
+    return {'WOW': compute_rho_WOW, 'HILL': compute_rho_HILL, 'S-UNIWARD': suniward.calculate_costs}
+
+def distortion_check(covers=None, message_chars=(1, 20, 300, 2000), seed=0):
+    # STC against cost-ordered LSB replacement on real cost maps: for every
+    # cover, cost function and message length STC must change fewer pixels
+    # at a lower total cost. Uniform random costs, as in benchmark(), do not
+    # show a trellis that picks poor paths. Near capacity (a quarter of the
+    # cover's pixels) LSB on the cheapest pixels can cost less, so the
+    # lengths stay well below that.
+    from skimage import data, img_as_float
+    from cost_lsb import embed_message_uint8
+    if covers is None:
+        apple = np.asarray(Image.open(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "apple.png")).convert('L'))
+        covers = {'apple.png': apple, 'camera': data.camera()}
+    rng = np.random.default_rng(seed)
+    worse = []
+    for cover_name, cover in covers.items():
+        for method, func in _real_cost_functions().items():
+            costs = np.asarray(func(img_as_float(cover)), dtype=np.float64)
+            for chars in message_chars:
+                message = ''.join(map(chr, rng.integers(32, 127, chars)))
+                lsb, _ = embed_message_uint8(cover.copy(), message, costs)
+                stc = embed_message_stc(cover.copy(), message, costs, b'check')
+                ok = extract_message_stc(stc, b'check') == message
+                (lsb_changes, lsb_cost), (stc_changes, stc_cost) = (
+                    (int(changed.sum()), float(costs[changed].sum())) for changed in (lsb != cover, stc != cover))
+                better = ok and stc_changes <= lsb_changes and stc_cost < lsb_cost
+                if not better:
+                    worse.append((cover_name, method, chars))
+                print(f"[{'✓' if better else '✗'}] {cover_name} {method:9s} {chars:5d} chars: STC {stc_changes} changes, "
+                      f"cost {stc_cost:.4g}; LSB {lsb_changes} changes, cost {lsb_cost:.4g}")
+    if worse:
+        raise RuntimeError(f"STC did not beat LSB replacement for {worse}")
+
+if __name__ == "__main__":
+    benchmark()
+    distortion_check()